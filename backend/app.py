@@ -1,379 +1,486 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-import requests
 import os
+import io
+import json
+import logging
+import sys
+import time
+import cProfile
+import pstats
+import numpy as np
 from dotenv import load_dotenv
 from collections import defaultdict
-import heapq
+from functools import partial
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nearest_neighbor import nearest_neighbor_tour
+from src.kruskal import kruskal_mst as sorted_kruskal_mst
+from src.prim import prim_mst as dense_prim_mst
+from src.tour import preorder_tour
+from src.local_search import local_search
+from src.christofides import christofides_tsp, EXACT_MATCHING_THRESHOLD
+from src.held_karp import held_karp_tsp, HELD_KARP_MAX_N
+from src.distances import distance_matrix as coordinate_distance_matrix
+from distance_cache import DistanceCache
+from geocode_cache import GeocodeCache, Geocoder
+from matrix_fetcher import MatrixFetcher
+from pipeline import SOLVERS, register_solver, solve_matrices, solve_route, DEFAULT_IMPROVE_BUDGET_MS
+from race import get_executor, race_solvers, start_executor
+from batch import solve_batch
+from jobs import JobQueue, solve_job
+from reoptimize import reoptimize_route
+from vrp import solve_vrp
+from windows import solve_time_windows
+from preview import hilbert_preview
+from metrics import finish_request, observe_request, render_metrics, stage, start_request
 
 
 load_dotenv()
 
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(),
+                    format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 # CORS(app)
 CORS(app, resources={r"/*": {"origins": "http://localhost:3000"}})
 
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
-print("Google Maps API Key:", GOOGLE_MAPS_API_KEY)
+logger.info("Google Maps API key %s", "configured" if GOOGLE_MAPS_API_KEY else "missing")
 FIX_START = "4 N 2nd St Suite 150, San Jose, CA 95113"
 
-def get_distance_matrix(locations):
-    url = "https://maps.googleapis.com/maps/api/distancematrix/json"
-    params = {
-        "origins": "|".join(locations),
-        "destinations": "|".join(locations),
-        "key": GOOGLE_MAPS_API_KEY,
+matrix_fetcher = MatrixFetcher(
+    os.getenv("DISTANCE_MATRIX_URL", "https://maps.googleapis.com/maps/api/distancematrix/json"),
+    GOOGLE_MAPS_API_KEY,
+    max_workers=int(os.getenv("DISTANCE_MATRIX_WORKERS", 4)),
+)
+
+geocode_cache = GeocodeCache(
+    os.getenv("GEOCODE_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "geocode_cache.sqlite3")),
+    max_entries=int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", 50000)),
+    touch_interval=int(os.getenv("GEOCODE_CACHE_TOUCH_INTERVAL", 300)),
+)
+geocoder = Geocoder(
+    os.getenv("GEOCODE_URL", "https://maps.googleapis.com/maps/api/geocode/json"),
+    GOOGLE_MAPS_API_KEY,
+    geocode_cache,
+)
+
+distance_cache = DistanceCache(
+    os.getenv("DISTANCE_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "distance_cache.sqlite3")),
+    ttl=int(os.getenv("DISTANCE_CACHE_TTL", 24 * 3600)),
+    max_entries=int(os.getenv("DISTANCE_CACHE_MAX_ENTRIES", 200000)),
+    touch_interval=int(os.getenv("DISTANCE_CACHE_TOUCH_INTERVAL", 300)),
+)
+
+
+def fetch_distance_matrix(origins, destinations):
+    logger.debug("Fetching distance matrix for %d origins and %d destinations", len(origins), len(destinations))
+    return matrix_fetcher.fetch(origins, destinations)
+
+
+# Degraded mode: "auto" estimates from cached geocodes when the API fails,
+# "always" skips the API whenever every address has coordinates, "never" just fails
+DISTANCE_FALLBACK = os.getenv("DISTANCE_FALLBACK", "auto")
+DEGRADED_SPEED_KMH = float(os.getenv("DEGRADED_SPEED_KMH", 40))
+DEGRADED_DETOUR_FACTOR = float(os.getenv("DEGRADED_DETOUR_FACTOR", 1.3))
+
+
+def estimate_distance_pairs(pairs):
+    """
+    Estimates road distance and duration from great-circle distances between cached geocodes.
+    :return: Dict of pair -> element marked "estimated", or None when an address has no coordinates
+    """
+    addresses = list(dict.fromkeys(address for pair in pairs for address in pair))
+    coordinates = geocode_cache.get_many(addresses)
+    if len(coordinates) < len(addresses):
+        return None
+
+    index = {address: i for i, address in enumerate(addresses)}
+    meters = coordinate_distance_matrix([coordinates[a] for a in addresses], "haversine") * DEGRADED_DETOUR_FACTOR
+    seconds = meters / (DEGRADED_SPEED_KMH / 3.6)
+    return {
+        (o, d): {
+            "status": "OK",
+            "estimated": True,
+            "distance": {"value": int(round(meters[index[o], index[d]]))},
+            "duration": {"value": int(round(seconds[index[o], index[d]]))},
+        }
+        for o, d in pairs
     }
-    
-    print("Sending request to API with parameters:", params)
 
+
+def get_distance_pairs(pairs):
+    """
+    Looks up (origin, destination) pairs in the cache and fetches the missing ones.
+    :return: Dict of pair -> (distance, duration), and dict of pair -> element to use as-is
+             (failed API elements, or estimates in degraded mode)
+    """
+    pairs = list(dict.fromkeys(pairs))
+    values = distance_cache.get_many(pairs)
+    missing_pairs = [pair for pair in pairs if pair not in values]
+    if not missing_pairs:
+        return values, {}
+
+    if DISTANCE_FALLBACK == "always":
+        estimates = estimate_distance_pairs(missing_pairs)
+        if estimates is not None:
+            return values, estimates
+
+    # Group origins by the destinations they are missing, one matrix per group
+    missing_by_origin = defaultdict(list)
+    for origin, destination in missing_pairs:
+        missing_by_origin[origin].append(destination)
+    missing = defaultdict(list)
+    for origin, destinations in missing_by_origin.items():
+        missing[tuple(destinations)].append(origin)
+
+    fetched = {}
+    overrides = {}
+    groups = list(missing.items())
+    logger.debug("Fetching %d missing pairs in %d distance matrices", len(missing_pairs), len(groups))
     try:
-        response = requests.get(url, params=params, timeout=10)  # Adding timeout
-        response.raise_for_status()  # Check if the response status is not 4xx or 5xx
-    except requests.exceptions.RequestException as e:
-        print(f"Request failed: {e}")
-        raise
-
-    print("Response Status Code:", response.status_code)
-    print("Response Text:", response.text)
-
-    if response.status_code == 200:
-        data = response.json()
-
-        if "rows" in data:
-            return data["rows"]
-        else:
-            raise Exception("Invalid response format, 'rows' not found.")
-    else:
-        raise Exception(f"Failed to fetch distance matrix from Google Maps API. Status Code: {response.status_code}")
+        # Every group is submitted to the fetcher pool up front and consumed in order
+        matrices = matrix_fetcher.fetch_many([(origins, destinations) for destinations, origins in groups])
+        for (destinations, origins), rows in zip(groups, matrices):
+            for origin, row in zip(origins, rows):
+                for destination, element in zip(destinations, row["elements"]):
+                    if element.get("status", "OK") == "OK":
+                        fetched[(origin, destination)] = (element["distance"]["value"], element["duration"]["value"])
+                    else:
+                        # Not cached, handed back as-is so the caller sees the failed element
+                        overrides[(origin, destination)] = element
+    except Exception as e:
+        remaining = [pair for pair in missing_pairs if pair not in fetched and pair not in overrides]
+        estimates = None if DISTANCE_FALLBACK == "never" else estimate_distance_pairs(remaining)
+        if estimates is None:
+            raise
+        logger.warning("Distance Matrix unavailable (%s), estimating %d pairs from cached geocodes", e, len(remaining))
+        overrides.update(estimates)
+
+    if fetched:
+        distance_cache.put_many(fetched)
+        values.update(fetched)
+        if DISTANCE_FALLBACK != "never":
+            geocoder.warm(address for pair in fetched for address in pair)
+    return values, overrides
+
+
+def distance_rows(locations, values, overrides):
+    """
+    Assembles Distance Matrix style rows for locations from looked-up pair values.
+    Rows containing estimated elements are flagged "estimated".
+    """
+    def element(origin, destination):
+        if (origin, destination) in overrides:
+            return overrides[(origin, destination)]
+        distance, duration = values[(origin, destination)]
+        return {"status": "OK", "distance": {"value": distance}, "duration": {"value": duration}}
+
+    rows = []
+    for o in locations:
+        row = {"elements": [element(o, d) for d in locations]}
+        if overrides and any(element.get("estimated") for element in row["elements"]):
+            row["estimated"] = True
+        rows.append(row)
+    return rows
+
+
+def get_distance_matrix(locations):
+    unique_locations = list(dict.fromkeys(locations))
+    values, overrides = get_distance_pairs((o, d) for o in unique_locations for d in unique_locations)
+    return distance_rows(locations, values, overrides)
+
+
+def run_solver_route(algo):
+    try:
+        response = solve_route(algo, request.get_json(), get_distance_matrix, FIX_START)
+        with stage("serialize"):
+            return jsonify(response)
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
+
+# Per-stage timings for every request, reported in the Server-Timing header and /metrics.
+# ?profile=1 attaches a cProfile summary of the request to JSON responses.
+PROFILE_LINES = int(os.getenv("PROFILE_LINES", 30))
+
+
+@app.before_request
+def start_timing():
+    g.timer, g.timer_token = start_request(request.endpoint or "unknown")
+    g.profiler = None
+    if request.args.get("profile") == "1":
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+@app.after_request
+def report_timing(response):
+    timer = g.get("timer")
+    if timer is None:
+        return response
+    if g.profiler is not None:
+        g.profiler.disable()
+        if response.is_json:
+            summary = io.StringIO()
+            pstats.Stats(g.profiler, stream=summary).sort_stats("cumulative").print_stats(PROFILE_LINES)
+            body = response.get_json()
+            body["profile"] = summary.getvalue()
+            response.set_data(json.dumps(body))
+    response.headers["Server-Timing"] = timer.server_timing()
+    if request.method == "POST":
+        observe_request(timer)
+    return response
+
+
+@app.teardown_request
+def stop_timing(exception=None):
+    if g.get("timer_token") is not None:
+        finish_request(g.timer_token)
+        g.timer_token = None
+
+
+@app.route("/solve", methods=["POST"])
+def solve():
+    return run_solver_route(request.args.get("algo", "greedy"))
 
 
 def solve_tsp_greedy(distances):
-    n = len(distances)
-    visited = [False] * n
-    path = [0]
-    visited[0] = True
-
-    for _ in range(n - 1):
-        last = path[-1]
-        # find the nearest non-visited
-        next_point = min(
-            [(i, distances[last][i]) for i in range(n) if not visited[i]],
-            key=lambda x: x[1],
-        )[0]
-        path.append(next_point)
-        visited[next_point] = True
-
-    path.append(0)  # back to the start point
+    path, _ = nearest_neighbor_tour(np.asarray(distances, dtype=np.int32), 0)
     return path
 
+
+@register_solver("greedy")
+def greedy_solver(distances, data):
+    return solve_tsp_greedy(distances), None
+
+
 @app.route("/greedy", methods=["POST"])
 def calculate_tsp():
-    try:
-        data = request.get_json()
-        locations = data.get("locations")
-        if FIX_START not in locations:
-            locations.insert(0, FIX_START)
-
-        if not locations or len(locations) < 2:
-            return jsonify({"success": False, "message": "At least two locations are required"})
-
-        distance_matrix = get_distance_matrix(locations)
-
-        distances = [
-            [row["elements"][i]["distance"]["value"] for i in range(len(row["elements"]))]
-            for row in distance_matrix
-        ]
-
-        durations = [
-            [row["elements"][i]["duration"]["value"] for i in range(len(row["elements"]))]
-            for row in distance_matrix
-        ]
-
-        tsp_order = solve_tsp_greedy(distances)
-
-        if not distances or not tsp_order or len(tsp_order) < 2:
-            raise Exception("Invalid data for TSP calculation")
-
-        total_distance = sum(
-            distances[tsp_order[i]][tsp_order[i + 1]] for i in range(len(tsp_order) - 1)
-        )
-
-        total_duration = sum(
-            durations[tsp_order[i]][tsp_order[i + 1]] for i in range(len(tsp_order) - 1)
-        )
-
-        ordered_locations = [locations[i] for i in tsp_order]
-
-        travel_details = []
-        for i in range(len(tsp_order) - 1):
-            start_location = ordered_locations[i]
-            end_location = ordered_locations[i + 1]
-            distance = distances[tsp_order[i]][tsp_order[i + 1]]
-            duration = durations[tsp_order[i]][tsp_order[i + 1]]
-            travel_details.append({
-                "from": start_location,
-                "to": end_location,
-                "distance": distance,
-                "duration": duration
-            })
-
-        return jsonify({
-            "success": True,
-            "orderedLocations": ordered_locations,
-            "totalDistance": total_distance,
-            "totalDuration": total_duration,
-            "travelDetails": travel_details
-        })
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)})
+    return run_solver_route("greedy")
 
 
 
 # Kruskal Algorithm
 def kruskal_mst(distances):
-    n = len(distances)
-    edges = []
-
-    for i in range(n):
-        for j in range(i + 1, n):
-            edges.append((distances[i][j], i, j))
-
-    edges.sort(key=lambda x: x[0])
-
-    parent = list(range(n))
-    rank = [0] * n
-
-    def find(node):
-        if parent[node] != node:
-            parent[node] = find(parent[node])
-        return parent[node]
-
-    def union(u, v):
-        root_u = find(u)
-        root_v = find(v)
-        if root_u != root_v:
-            if rank[root_u] > rank[root_v]:
-                parent[root_v] = root_u
-            elif rank[root_u] < rank[root_v]:
-                parent[root_u] = root_v
-            else:
-                parent[root_v] = root_u
-                rank[root_u] += 1
-
-    mst = defaultdict(list)
-    for weight, u, v in edges:
-        if find(u) != find(v):
-            union(u, v)
-            mst[u].append(v)
-            mst[v].append(u)
-
-    print("MST from Kruskal's Algorithm (Edges):")
-    for node, neighbors in mst.items():
-        print(f"Node {node}: {neighbors}")
+    mst = sorted_kruskal_mst(distances)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("MST from Kruskal's Algorithm (Edges):")
+        for node, neighbors in mst.items():
+            logger.debug("Node %s: %s", node, neighbors)
 
     return mst
 
 
-def dfs(mst, node, visited, path):
-    visited.add(node)
-    path.append(node)
-    for neighbor in mst[node]:
-        if neighbor not in visited:
-            dfs(mst, neighbor, visited, path)
+def kruskal_tsp(mst, start):
+    # Iterative preorder walk of the MST, shortcut and closed at the start
+    return preorder_tour(mst, start)
 
-def shortcut(path):
-    visited = set()
-    new_path = []
-    for city in path:
-        if city not in visited:
-            new_path.append(city)
-            visited.add(city)
-    return new_path
 
-def kruskal_tsp(mst, start):
-    visited = set()
-    path = []
-    
-    # Perform DFS on the MST
-    dfs(mst, start, visited, path)
-    
-    # Apply shortcutting to avoid repeated cities
-    tsp_path = shortcut(path)
-    
-    # Make the path circular (return to the start)
-    tsp_path.append(tsp_path[0])
-    
-    return tsp_path
+@register_solver("kruskal")
+def kruskal_solver(distances, data):
+    return kruskal_tsp(kruskal_mst(distances), 0), None
+
 
 @app.route("/kruskal", methods=["POST"])
 def calculate_tsp_kruskal():
-    try:
-        data = request.get_json()
-        locations = data.get("locations")
+    return run_solver_route("kruskal")
 
-        # Start point is fixed
-        FIX_START = locations[0]  
-        if FIX_START not in locations:
-            locations.insert(0, FIX_START)
 
-        if not locations or len(locations) < 2:
-            return jsonify({"success": False, "message": "At least two locations are required"})
 
-        distance_matrix = get_distance_matrix(locations)
+#Prim's TSP algorithm
+def prim_mst(distances):
+    mst = dense_prim_mst(distances)
 
-        distances = [[row["elements"][i]["distance"]["value"] for i in range(len(row["elements"]))] for row in distance_matrix]
-        durations = [[row["elements"][i]["duration"]["value"] for i in range(len(row["elements"]))] for row in distance_matrix]
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("MST from Prim's Algorithm (Edges):")
+        for node, neighbors in mst.items():
+            logger.debug("Node %s: %s", node, neighbors)
 
-        print("Distances:", distances)
-        print("Durations:", durations)
+    return mst
 
-        mst = kruskal_mst(distances)
+# Prim's TSP path reconstruction (preorder walk visiting all nodes)
+def prim_tsp(mst, start):
+    return preorder_tour(mst, start)
 
-        # Get TSP path from MST
-        tsp_order = kruskal_tsp(mst, 0)
 
-        ordered_locations = [locations[i] for i in tsp_order]
+@register_solver("prim")
+def prim_solver(distances, data):
+    return prim_tsp(prim_mst(distances), 0), None
+
+
+@app.route("/prim", methods=["POST"])
+def calculate_tsp_prim():
+    return run_solver_route("prim")
+
 
-        total_distance = sum(
-            distances[tsp_order[i]][tsp_order[i + 1]] for i in range(len(tsp_order) - 1)
-        )
+# Christofides' algorithm
+# The exact matching DP is O(2^threshold) memory and pure Python time (about 0.13 s at 16, 2.4 s at 20),
+# so requests can lower the threshold but not exceed this
+EXACT_MATCHING_THRESHOLD_MAX = int(os.getenv("EXACT_MATCHING_THRESHOLD_MAX", 16))
 
-        total_duration = sum(
-            durations[tsp_order[i]][tsp_order[i + 1]] for i in range(len(tsp_order) - 1)
-        )
 
-        print("Total distance:", total_distance)
-        print("Total duration:", total_duration)
+@register_solver("christofides")
+def christofides_solver(distances, data):
+    threshold = min(int(data.get("exactMatchingThreshold", EXACT_MATCHING_THRESHOLD)), EXACT_MATCHING_THRESHOLD_MAX)
+    tsp_order, _, timings = christofides_tsp(distances, 0, exact_threshold=threshold)
+    return tsp_order, {"timings": {stage: round(ms, 3) for stage, ms in timings.items()}}
 
-        travel_details = []
-        for i in range(len(tsp_order) - 1):
-            start_location = ordered_locations[i]
-            end_location = ordered_locations[i + 1]
-            distance = distances[tsp_order[i]][tsp_order[i + 1]]
-            duration = durations[tsp_order[i]][tsp_order[i + 1]]
-            travel_details.append({
-                "from": start_location,
-                "to": end_location,
-                "distance": distance,
-                "duration": duration
-            })
 
-        return jsonify({
-            "success": True,
-            "orderedLocations": ordered_locations,
-            "totalDistance": total_distance,
-            "totalDuration": total_duration
-        })
+@app.route("/christofides", methods=["POST"])
+def calculate_tsp_christofides():
+    return run_solver_route("christofides")
 
+
+# Exact Held-Karp for small routes, greedy + local search above the cutoff
+EXACT_MAX_LOCATIONS = int(os.getenv("EXACT_MAX_LOCATIONS", HELD_KARP_MAX_N))
+
+
+@register_solver("exact")
+def exact_solver(distances, data):
+    exact = len(distances) <= EXACT_MAX_LOCATIONS
+    if exact:
+        tsp_order, _ = held_karp_tsp(distances, 0, max_n=EXACT_MAX_LOCATIONS)
+    else:
+        tsp_order, _ = local_search(solve_tsp_greedy(distances), distances,
+                                    time_budget_ms=DEFAULT_IMPROVE_BUDGET_MS)
+    return tsp_order, {"exact": exact}
+
+
+@app.route("/exact", methods=["POST"])
+def calculate_tsp_exact():
+    return run_solver_route("exact")
+
+
+# Run several solvers in parallel on one matrix and keep the shortest tour
+@app.route("/best", methods=["POST"])
+def calculate_tsp_best():
+    try:
+        return jsonify(race_solvers(request.get_json(), get_distance_matrix, FIX_START))
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
 
+# Many independent routes in one request, streamed back as NDJSON
+@app.route("/batch", methods=["POST"])
+def calculate_tsp_batch():
+    try:
+        results = solve_batch(request.get_json(), get_distance_pairs, distance_rows, FIX_START)
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
 
-#Prim's TSP algorithm
-def prim_mst(distances):
-    n = len(distances)
-    # To store the MST
-    mst = defaultdict(list)
-    visited = [False] * n
-    min_heap = [(0, 0, -1)]  # (weight, node), starting from node 0
-
-    while min_heap:
-        weight, u, v = heapq.heappop(min_heap)
-
-        if visited[u]:
-            continue
-        visited[u] = True
-        if v != -1:
-            mst[u].append(v)
-            mst[v].append(u)
-
-        # Add the selected node to the MST
-        for v in range(n):
-            if not visited[v] and distances[u][v] > 0:  # Avoid self-loops
-                heapq.heappush(min_heap, (distances[u][v], v, u))
-                # mst[u].append(v)
-                # mst[v].append(u)
-
-    # Print MST after it's constructed
-    print("MST from Prim's Algorithm (Edges):")
-    for node, neighbors in mst.items():
-        print(f"Node {node}: {neighbors}")
+    lines = (json.dumps(result) + "\n" for result in results)
+    return Response(stream_with_context(lines), mimetype="application/x-ndjson")
 
-    return mst
 
-# Prim's TSP path reconstruction (using DFS to visit all nodes)
-def prim_tsp(mst, start):
-    visited = set()
-    path = []
-
-    def dfs(node):
-        visited.add(node)
-        path.append(node)
-        for neighbor in mst[node]:
-            if neighbor not in visited:
-                dfs(neighbor)
-
-    dfs(start)
-    path.append(start)  # Return to the starting point
-    return path
+# Add or cancel stops on a solved route without re-solving it
+@app.route("/reoptimize", methods=["POST"])
+def calculate_tsp_reoptimize():
+    try:
+        return jsonify(reoptimize_route(request.get_json(), get_distance_matrix, FIX_START))
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
 
-@app.route("/prim", methods=["POST"])
-def calculate_tsp_prim():
+
+# Several vehicles with capacity and shift-length limits; routes are improved in the race process pool
+@app.route("/vrp", methods=["POST"])
+def calculate_vrp():
+    try:
+        return jsonify(solve_vrp(request.get_json(), get_distance_matrix, FIX_START, get_executor()))
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
+
+# Delivery windows and service times, built by feasible insertion
+@app.route("/timewindows", methods=["POST"])
+def calculate_tsp_time_windows():
+    try:
+        return jsonify(solve_time_windows(request.get_json(), get_distance_matrix, FIX_START))
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
+
+# Straight-line preview in Hilbert curve order from geocoded coordinates, no distance matrix
+@app.route("/hilbert", methods=["POST"])
+def calculate_tsp_hilbert():
+    try:
+        return jsonify(hilbert_preview(request.get_json(), geocoder.geocode_many, FIX_START))
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
+
+# Long-running solves: submit a job and poll it for progress
+job_queue = JobQueue()
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
     try:
         data = request.get_json()
-        locations = data.get("locations")
+        algo = data.get("algo", "greedy")
+        if algo not in SOLVERS:
+            raise Exception(f"Unknown algorithm '{algo}', expected one of {', '.join(SOLVERS)}")
+        job_id = job_queue.submit(partial(solve_job, job_queue), algo, data, get_distance_matrix, FIX_START)
+        return jsonify({"success": True, "jobId": job_id})
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
 
-        if FIX_START not in locations:
-            locations.insert(0, FIX_START)
 
-        if not locations or len(locations) < 2:
-            return jsonify({"success": False, "message": "At least two locations are required"})
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": f"Unknown job '{job_id}'"}), 404
+    return jsonify({"success": True, "job": job})
 
-        distance_matrix = get_distance_matrix(locations)
 
-        # Calculate the distances matrix from the distance matrix response
-        distances = [
-            [row["elements"][i]["distance"]["value"] for i in range(len(row["elements"]))]
-            for row in distance_matrix
-        ]
-        durations = [
-            [row["elements"][i]["duration"]["value"] for i in range(len(row["elements"]))]
-            for row in distance_matrix
-        ]
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
 
-        print("Prim Distances:", distances)
-        print("Prim Durations:", durations)
 
-        # Apply Prim's Algorithm to find the MST
-        mst = prim_mst(distances)
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    return jsonify(distance_cache.stats())
 
-        # Get the TSP path using DFS on the MST
-        tsp_order = prim_tsp(mst, 0)
 
-        # Convert the path order to the corresponding locations
-        ordered_locations = [locations[i] for i in tsp_order]
+# Production serving: gunicorn -c gunicorn.conf.py preloads create_app() once and forks workers
+def warm_up(sizes=(8, 40)):
+    """
+    Runs every registered solver and the improvement moves on small random matrices, so NumPy
+    and the solver code paths are initialized once in the parent instead of in every worker.
+    """
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        coords = rng.random((n, 2)) * 10000
+        distances = coordinate_distance_matrix(coords).astype(np.int32)
+        locations = [f"warm-up {i}" for i in range(n)]
+        for algo in SOLVERS:
+            solve_matrices(algo, {"improve": "2opt+oropt"}, locations, distances, distances)
 
-        # Calculate total distance
-        total_distance = sum(
-            distances[tsp_order[i]][tsp_order[i + 1]] for i in range(len(tsp_order) - 1)
-        )
 
-        total_duration = sum(
-            durations[tsp_order[i]][tsp_order[i + 1]] for i in range(len(tsp_order) - 1)
-        )
+def after_fork():
+    """
+    Gives a forked worker its own SQLite connections and solver pool. gunicorn calls it
+    before the worker starts its request threads; the pool is not created in create_app,
+    which runs in the preloading master whose processes the workers could not use.
+    """
+    distance_cache.connect()
+    geocode_cache.connect()
+    start_executor()
 
-        return jsonify({
-            "success": True,
-            "orderedLocations": ordered_locations,
-            "totalDistance": total_distance,
-            "totalDuration": total_duration
-        })
 
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)})
+def create_app():
+    started = time.perf_counter()
+    warm_up()
+    logger.info("Warmed up %d solvers in %.0f ms", len(SOLVERS), (time.perf_counter() - started) * 1000)
+    return app
 
 
 if __name__ == '__main__':
+    start_executor()
     app.run(host="0.0.0.0", port=5001) 
\ No newline at end of file
@@ -0,0 +1,88 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from metrics import label_request, stage
+from pipeline import SOLVERS, is_degraded, parse_distance_matrix, solve_matrices
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", min(8, os.cpu_count() or 1)))
+
+
+def prepare_routes(routes, fix_start):
+    """
+    Normalizes the routes of a batch and de-duplicates addresses across them.
+    :param routes: List of {"id": ..., "locations": [...]} (extra keys override batch options)
+    :return: List of (route_id, locations, options) and the set of (origin, destination) pairs needed
+    """
+    prepared = []
+    pairs = set()
+    for index, route in enumerate(routes):
+        route_id = route.get("id", index)
+        locations = list(route.get("locations") or [])
+        if fix_start not in locations:
+            locations.insert(0, fix_start)
+        if len(locations) < 2:
+            prepared.append((route_id, None, route))
+            continue
+        prepared.append((route_id, locations, route))
+        pairs.update((o, d) for o in locations for d in locations)
+    return prepared, pairs
+
+
+def solve_batch(data, fetch_pairs, build_rows, fix_start, workers=BATCH_WORKERS):
+    """
+    Solves many independent routes against one combined distance lookup.
+    Validation and the combined fetch happen up front; the returned generator then solves
+    routes on a thread pool and yields each result as soon as it completes, keeping only
+    a few routes in flight.
+    :param data: {"routes": [...], "algo": "greedy", ...}; per-route keys override the batch options
+    :param fetch_pairs: Callable(pairs) -> (values, overrides), e.g. get_distance_pairs
+    :param build_rows: Callable(locations, values, overrides) -> Distance Matrix rows
+    :param fix_start: Depot address inserted first in every route
+    :return: Generator of per-route response dicts carrying the route "id"
+    """
+    routes = data.get("routes") or []
+    defaults = {key: value for key, value in data.items() if key != "routes"}
+    algo = data.get("algo", "greedy")
+    if algo not in SOLVERS:
+        raise Exception(f"Unknown algorithm '{algo}', expected one of {', '.join(SOLVERS)}")
+
+    prepared, pairs = prepare_routes(routes, fix_start)
+    label_request(algorithm="batch")
+    with stage("fetch"):
+        values, overrides = fetch_pairs(pairs)
+    del pairs
+
+    def solve_one(route_id, locations, route):
+        try:
+            if locations is None:
+                raise Exception("At least two locations are required")
+            options = {**defaults, **route}
+            route_algo = options.get("algo", algo)
+            if route_algo not in SOLVERS:
+                raise Exception(f"Unknown algorithm '{route_algo}', expected one of {', '.join(SOLVERS)}")
+            rows = build_rows(locations, values, overrides)
+            distances, durations = parse_distance_matrix(rows, locations)
+            response = solve_matrices(route_algo, options, locations, distances, durations,
+                                      degraded=is_degraded(rows))
+        except Exception as e:
+            response = {"success": False, "message": str(e)}
+        return {"id": route_id, **response}
+
+    def results():
+        pending = iter(prepared)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = set()
+            for route_id, locations, route in pending:
+                in_flight.add(executor.submit(solve_one, route_id, locations, route))
+                if len(in_flight) >= 2 * workers:
+                    break
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                    next_route = next(pending, None)
+                    if next_route is not None:
+                        in_flight.add(executor.submit(solve_one, *next_route))
+
+    return results()
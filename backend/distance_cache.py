@@ -0,0 +1,121 @@
+import sqlite3
+import threading
+import time
+
+
+class DistanceCache:
+    """
+    Pair-level cache of Distance Matrix elements stored in SQLite.
+    Entries are keyed on (origin, destination), expire after `ttl` seconds
+    and the least recently used ones are evicted once `max_entries` is exceeded.
+    """
+
+    # Destinations per SELECT, below SQLite's bound-parameter limit
+    QUERY_CHUNK = 500
+
+    def __init__(self, path, ttl=24 * 3600, max_entries=200000, touch_interval=300):
+        self.path = path
+        self.ttl = ttl
+        self.touch_interval = touch_interval
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.connect()
+
+    def connect(self):
+        """
+        Opens the SQLite connection; called again in forked server workers, which must not share it.
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pairs (
+                origin TEXT NOT NULL,
+                destination TEXT NOT NULL,
+                distance INTEGER NOT NULL,
+                duration INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (origin, destination)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pairs_last_used ON pairs (last_used)")
+        self._conn.commit()
+
+    def get_many(self, pairs):
+        """
+        Looks up (origin, destination) pairs with one query per origin and chunk of destinations.
+        last_used is only rewritten for entries not touched in the last `touch_interval` seconds,
+        so a fully cached request does not update every row it reads.
+        :param pairs: Iterable of (origin, destination) tuples
+        :return: Dict mapping each cached pair to (distance, duration); missing or expired pairs are left out
+        """
+        pairs = list(dict.fromkeys(pairs))
+        by_origin = {}
+        for origin, destination in pairs:
+            by_origin.setdefault(origin, []).append(destination)
+        now = time.time()
+        found = {}
+        expired = []
+        touched = []
+        with self._lock:
+            for origin, destinations in by_origin.items():
+                for start in range(0, len(destinations), self.QUERY_CHUNK):
+                    chunk = destinations[start:start + self.QUERY_CHUNK]
+                    rows = self._conn.execute(
+                        "SELECT destination, distance, duration, fetched_at, last_used FROM pairs "
+                        f"WHERE origin = ? AND destination IN ({', '.join('?' * len(chunk))})",
+                        [origin, *chunk],
+                    )
+                    for destination, distance, duration, fetched_at, last_used in rows:
+                        if now - fetched_at > self.ttl:
+                            expired.append((origin, destination))
+                            continue
+                        found[(origin, destination)] = (distance, duration)
+                        if now - last_used > self.touch_interval:
+                            touched.append((now, origin, destination))
+
+            if expired:
+                self._conn.executemany("DELETE FROM pairs WHERE origin = ? AND destination = ?", expired)
+            if touched:
+                self._conn.executemany(
+                    "UPDATE pairs SET last_used = ? WHERE origin = ? AND destination = ?", touched
+                )
+            if expired or touched:
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(pairs) - len(found)
+        return found
+
+    def put_many(self, values):
+        """
+        Stores pairs and evicts the least recently used entries above `max_entries`.
+        :param values: Dict mapping (origin, destination) to (distance, duration)
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pairs VALUES (?, ?, ?, ?, ?, ?)",
+                [(o, d, dist, dur, now, now) for (o, d), (dist, dur) in values.items()],
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM pairs").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM pairs WHERE rowid IN (SELECT rowid FROM pairs ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM pairs").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM pairs")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
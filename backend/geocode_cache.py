@@ -0,0 +1,156 @@
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from matrix_fetcher import describe_request_error
+
+logger = logging.getLogger(__name__)
+
+
+class GeocodeCache:
+    """
+    Address -> (lat, lng) cache stored in SQLite.
+    Geocodes rarely change, so entries do not expire; the least recently used
+    ones are evicted once `max_entries` is exceeded.
+    """
+
+    # Addresses per SELECT, below SQLite's bound-parameter limit
+    QUERY_CHUNK = 500
+
+    def __init__(self, path, max_entries=50000, touch_interval=300):
+        self.path = path
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.connect()
+
+    def connect(self):
+        # Reopened per server worker after fork, like DistanceCache.connect
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS geocodes (
+                address TEXT PRIMARY KEY,
+                lat REAL NOT NULL,
+                lng REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS geocodes_last_used ON geocodes (last_used)")
+        self._conn.commit()
+
+    def get_many(self, addresses):
+        """
+        Looks up addresses in chunks with one query each. last_used is only rewritten for entries
+        not touched in the last `touch_interval` seconds, like DistanceCache.get_many.
+        :return: Dict mapping each cached address to (lat, lng)
+        """
+        addresses = list(dict.fromkeys(addresses))
+        now = time.time()
+        found = {}
+        touched = []
+        with self._lock:
+            for start in range(0, len(addresses), self.QUERY_CHUNK):
+                chunk = addresses[start:start + self.QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT address, lat, lng, last_used FROM geocodes WHERE address IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for address, lat, lng, last_used in rows:
+                    found[address] = (lat, lng)
+                    if now - last_used > self.touch_interval:
+                        touched.append((now, address))
+            if touched:
+                self._conn.executemany("UPDATE geocodes SET last_used = ? WHERE address = ?", touched)
+                self._conn.commit()
+        return found
+
+    def put_many(self, coordinates):
+        """
+        :param coordinates: Dict mapping address to (lat, lng)
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?, ?)",
+                [(address, lat, lng, now) for address, (lat, lng) in coordinates.items()],
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM geocodes").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM geocodes WHERE rowid IN (SELECT rowid FROM geocodes ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+
+class Geocoder:
+    """
+    Fills a GeocodeCache from the Geocoding API in the background, one address per request.
+    """
+
+    def __init__(self, url, api_key, cache, timeout=10):
+        self.url = url
+        self.api_key = api_key
+        self.cache = cache
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="geocode")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def geocode(self, address):
+        try:
+            response = self.session.get(self.url, params={"address": address, "key": self.api_key},
+                                        timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            # Raised without the original, its message carries the request URL with the API key
+            raise Exception(f"Geocoding failed for '{address}': {describe_request_error(e)}") from None
+        data = response.json()
+        if data.get("status") != "OK" or not data.get("results"):
+            raise Exception(f"Geocoding failed for '{address}' with status {data.get('status')}")
+        location = data["results"][0]["geometry"]["location"]
+        return location["lat"], location["lng"]
+
+    def geocode_many(self, addresses, workers=8):
+        """
+        Coordinates of every address, from the cache first and the API for the rest.
+        :return: Dict mapping address to (lat, lng); raises when an address cannot be geocoded
+        """
+        addresses = list(dict.fromkeys(addresses))
+        found = self.cache.get_many(addresses)
+        missing = [address for address in addresses if address not in found]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as executor:
+                fetched = dict(zip(missing, executor.map(self.geocode, missing)))
+            self.cache.put_many(fetched)
+            found.update(fetched)
+        return found
+
+    def warm(self, addresses):
+        """
+        Queues geocoding of the addresses that are not cached yet; failures are skipped.
+        """
+        addresses = list(dict.fromkeys(addresses))
+        cached = self.cache.get_many(addresses)
+        with self._lock:
+            missing = [a for a in addresses if a not in cached and a not in self._pending]
+            self._pending.update(missing)
+        if missing:
+            self._executor.submit(self._fill, missing)
+
+    def _fill(self, addresses):
+        for address in addresses:
+            try:
+                self.cache.put_many({address: self.geocode(address)})
+            except Exception as e:
+                logger.warning("Geocoding skipped: %s", e)
+            finally:
+                with self._lock:
+                    self._pending.discard(address)
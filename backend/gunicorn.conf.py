@@ -0,0 +1,39 @@
+"""
+Production serving for the SmartRoutes backend:
+
+    cd backend && gunicorn -c gunicorn.conf.py
+
+The app is imported and warmed up once in the master (preload_app) and workers are forked
+from it, so solver modules and NumPy are shared copy-on-write instead of loaded per worker.
+Jobs (/jobs) and /metrics live in each worker's memory, so job polling needs GUNICORN_WORKERS=1
+(scale with threads) or sticky routing.
+"""
+import multiprocessing
+import os
+
+wsgi_app = "app:create_app()"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5001")
+preload_app = True
+
+# Solvers are CPU bound NumPy code, so one process per core; threads overlap Distance Matrix I/O
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+# Every worker forks its own solver pool for /best and /vrp at startup, so the host runs
+# workers * RACE_WORKERS solver processes on top of the workers. By default each pool gets the
+# worker's share of the CPUs, at least 3 (one default race): 16 cores -> 16 workers x 3 = 48.
+os.environ.setdefault("RACE_WORKERS", str(max(3, multiprocessing.cpu_count() // workers)))
+worker_class = "gthread"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+# Recycle workers now and then to cap memory growth from large matrices
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 0))
+
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+
+
+def post_fork(server, worker):
+    import app
+
+    app.after_fork()
@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline import SOLVERS, load_matrices, solve_matrices
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+MAX_JOBS = int(os.getenv("MAX_JOBS", 1000))
+
+
+class JobQueue:
+    """
+    In-process job queue for long-running solves.
+    A bounded thread pool runs the jobs; state and progress live in memory and the
+    oldest finished jobs are forgotten once more than `max_jobs` are kept.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, max_jobs=MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="solve-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """
+        Queues func(job_id, *args) and returns the new job id.
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                "id": job_id,
+                "status": "queued",
+                "submittedAt": time.time(),
+                "startedAt": None,
+                "finishedAt": None,
+                "progress": None,
+                "result": None,
+                "error": None,
+            }
+            self._evict()
+        self._executor.submit(self._run, job_id, func, args)
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return None if job is None else dict(job)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def _run(self, job_id, func, args):
+        self.update(job_id, status="running", startedAt=time.time())
+        try:
+            result = func(job_id, *args)
+            self.update(job_id, status="done", result=result, finishedAt=time.time())
+        except Exception as e:
+            self.update(job_id, status="failed", error=str(e), finishedAt=time.time())
+
+    def _evict(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in ("done", "failed")]
+        for job_id in finished[:max(len(self._jobs) - self.max_jobs, 0)]:
+            del self._jobs[job_id]
+
+
+def solve_job(queue, job_id, algo, data, fetch_matrix, fix_start):
+    """
+    Job body for a route solve: publishes the best tour so far while the improvement stage runs.
+    """
+    if algo not in SOLVERS:
+        raise Exception(f"Unknown algorithm '{algo}', expected one of {', '.join(SOLVERS)}")
+    locations, distances, durations, degraded = load_matrices(data, fetch_matrix, fix_start)
+
+    def progress(tsp_order, total_distance, iterations):
+        queue.update(job_id, progress={
+            "iterations": iterations,
+            "bestDistance": total_distance,
+            "bestTour": [locations[i] for i in tsp_order],
+        })
+
+    return solve_matrices(algo, data, locations, distances, durations, progress, degraded)
@@ -0,0 +1,72 @@
+"""
+Load test for the route endpoints, reporting throughput and latency percentiles per endpoint.
+
+Against the local stub distance provider:
+
+    python stub_distance_api.py --port 5002 &
+    DISTANCE_MATRIX_URL=http://127.0.0.1:5002/maps/api/distancematrix/json \
+    GEOCODE_URL=http://127.0.0.1:5002/maps/api/geocode/json gunicorn -c gunicorn.conf.py &
+    python load_test.py --url http://127.0.0.1:5001 --requests 200 --concurrency 16
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+DEFAULT_ENDPOINTS = ["/greedy", "/kruskal", "/prim", "/christofides", "/exact", "/best"]
+
+
+def run_endpoint(url, endpoint, args):
+    """
+    Sends args.requests POSTs to one endpoint from args.concurrency threads.
+    :return: (latencies in seconds, error count, wall time in seconds)
+    """
+    session = requests.Session()
+    pool = [f"{args.prefix} {i}" for i in range(args.pool)]
+    rng = random.Random(args.seed)
+    payloads = [{"locations": rng.sample(pool, args.locations)} for _ in range(args.requests)]
+
+    def send(payload):
+        started = time.perf_counter()
+        try:
+            response = session.post(url + endpoint, json=payload, timeout=args.timeout)
+            ok = response.status_code == 200 and response.json().get("success")
+        except requests.exceptions.RequestException:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(send, payloads))
+    wall = time.perf_counter() - started
+    return [latency for latency, _ in results], sum(1 for _, ok in results if not ok), wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the SmartRoutes backend")
+    parser.add_argument("--url", default="http://127.0.0.1:5001")
+    parser.add_argument("--endpoints", nargs="+", default=DEFAULT_ENDPOINTS)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--locations", type=int, default=20, help="Locations per request")
+    parser.add_argument("--pool", type=int, default=100, help="Distinct addresses requests are drawn from")
+    parser.add_argument("--prefix", default="load test stop", help="Address prefix, change it to start cold")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.locations > args.pool:
+        parser.error("--locations cannot exceed --pool")
+
+    print(f"{'endpoint':>14} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for endpoint in args.endpoints:
+        latencies, errors, wall = run_endpoint(args.url.rstrip("/"), endpoint, args)
+        ms = np.array(latencies) * 1000
+        print(f"{endpoint:>14} {len(latencies):>9} {errors:>7} {len(latencies) / wall:>8.1f} "
+              f"{np.percentile(ms, 50):>8.1f} {np.percentile(ms, 99):>8.1f} {ms.max():>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Statuses returned by the Distance Matrix API that are worth retrying
+RETRY_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+RETRY_HTTP_CODES = {429, 500, 502, 503, 504}
+
+logger = logging.getLogger(__name__)
+
+
+def describe_request_error(e):
+    """
+    Short description of a requests exception without its URL, whose query string holds the API key.
+    """
+    response = getattr(e, "response", None)
+    if response is not None:
+        return f"{type(e).__name__} (HTTP {response.status_code})"
+    return type(e).__name__
+
+
+class MatrixFetcher:
+    """
+    Fetches Distance Matrix responses in tiles that respect the provider's per-request limits.
+    Tiles are requested concurrently over a pooled requests.Session and stitched back into
+    the `rows` structure of a single response.
+    """
+
+    def __init__(self, url, api_key, max_origins=25, max_destinations=25, max_elements=100,
+                 max_workers=4, retries=3, backoff=0.5, timeout=10):
+        self.url = url
+        self.api_key = api_key
+        self.max_origins = max_origins
+        self.max_destinations = max_destinations
+        self.max_elements = max_elements
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="matrix-fetch")
+
+    def tiles(self, n_origins, n_destinations):
+        """
+        Splits an n_origins x n_destinations matrix into tiles within the element limits.
+        :return: List of (origin_start, origin_end, destination_start, destination_end)
+        """
+        dest_step = max(1, min(n_destinations, self.max_destinations, self.max_elements))
+        origin_step = max(1, min(self.max_origins, self.max_elements // dest_step))
+        return [
+            (o, min(o + origin_step, n_origins), d, min(d + dest_step, n_destinations))
+            for o in range(0, n_origins, origin_step)
+            for d in range(0, n_destinations, dest_step)
+        ]
+
+    def fetch(self, origins, destinations):
+        """
+        Fetches the full origins x destinations matrix.
+        :return: List of rows, each {"elements": [...]} with one element per destination
+        """
+        return next(self.fetch_many([(origins, destinations)]))
+
+    def fetch_many(self, matrices):
+        """
+        Fetches several origins x destinations matrices, submitting the tiles of all of them
+        to the pool at once so small matrices are requested concurrently, not one after another.
+        :param matrices: List of (origins, destinations)
+        :return: Generator of rows per matrix, in order; tiles not yet started are cancelled
+                 when the caller stops early or a tile fails
+        """
+        submitted = []
+        for origins, destinations in matrices:
+            origins = list(origins)
+            destinations = list(destinations)
+            futures = [
+                (o0, o1, d0, d1, self._executor.submit(self._fetch_tile, origins[o0:o1], destinations[d0:d1]))
+                for o0, o1, d0, d1 in self.tiles(len(origins), len(destinations))
+            ]
+            submitted.append((len(origins), len(destinations), futures))
+
+        try:
+            for n_origins, n_destinations, futures in submitted:
+                rows = [{"elements": [None] * n_destinations} for _ in range(n_origins)]
+                for o0, o1, d0, d1, future in futures:
+                    for row, tile_row in zip(rows[o0:o1], future.result()):
+                        row["elements"][d0:d1] = tile_row["elements"]
+                yield rows
+        finally:
+            for _, _, futures in submitted:
+                for *_, future in futures:
+                    future.cancel()
+
+    def _fetch_tile(self, origins, destinations):
+        params = {
+            "origins": "|".join(origins),
+            "destinations": "|".join(destinations),
+            "key": self.api_key,
+        }
+
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                response = self.session.get(self.url, params=params, timeout=self.timeout)
+                if response.status_code in RETRY_HTTP_CODES and not last_attempt:
+                    time.sleep(self.backoff * 2 ** attempt)
+                    continue
+                response.raise_for_status()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                logger.warning("Distance Matrix request for a %dx%d tile failed (attempt %d): %s",
+                               len(origins), len(destinations), attempt + 1, describe_request_error(e))
+                if last_attempt:
+                    # Raised without the original, its message carries the request URL
+                    raise Exception(f"Distance Matrix request failed: {describe_request_error(e)}") from None
+                time.sleep(self.backoff * 2 ** attempt)
+                continue
+            except requests.exceptions.HTTPError as e:
+                raise Exception(f"Distance Matrix request failed: {describe_request_error(e)}") from None
+
+            data = response.json()
+            status = data.get("status", "OK")
+            if status in RETRY_STATUSES and not last_attempt:
+                time.sleep(self.backoff * 2 ** attempt)
+                continue
+            if status != "OK":
+                raise Exception(f"Distance Matrix request failed with status {status}")
+            if "rows" not in data:
+                raise Exception("Invalid response format, 'rows' not found.")
+            return data["rows"]
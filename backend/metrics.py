@@ -0,0 +1,148 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Route sizes are bucketed so the label set stays small
+SIZE_BUCKETS = (10, 25, 50, 100, 250, 1000)
+
+_current = ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    """
+    Stage timings of one request, in milliseconds and in the order the stages first ran.
+    """
+
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+        self.n = None
+        self.stages = {}
+        self.started = time.perf_counter()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        """
+        :return: Server-Timing header value, e.g. "fetch;dur=120.5, solve;dur=3.2, total;dur=124.0"
+        """
+        parts = [f"{name};dur={ms:.2f}" for name, ms in self.stages.items()]
+        parts.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(parts)
+
+
+def start_request(algorithm):
+    """
+    Starts timing the current request; stages run in this context are recorded on the returned timer.
+    :return: (timer, token) where token is passed to finish_request
+    """
+    timer = RequestTimer(algorithm)
+    return timer, _current.set(timer)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+def label_request(algorithm=None, n=None):
+    """
+    Sets the metric labels of the current request, a no-op outside a timed request.
+    """
+    timer = _current.get()
+    if timer is None:
+        return
+    if algorithm is not None:
+        timer.algorithm = algorithm
+    if n is not None:
+        timer.n = n
+
+
+@contextmanager
+def stage(name):
+    """
+    Times a block as stage `name` of the current request; costs one lookup outside a timed request
+    (solver processes, job and batch worker threads).
+    """
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.stages[name] = timer.stages.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+def size_bucket(n):
+    if n is None:
+        return "unknown"
+    for bound in SIZE_BUCKETS:
+        if n <= bound:
+            return f"le{bound}"
+    return f"gt{SIZE_BUCKETS[-1]}"
+
+
+class Histogram:
+    """
+    Cumulative Prometheus histogram keyed by a tuple of label values.
+    """
+
+    def __init__(self, name, description, label_names, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                label_text = ",".join(f'{key}="{value}"' for key, value in zip(self.label_names, labels))
+                for bound, count in zip(self.buckets, series["counts"]):
+                    lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {count}')
+                lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {series["count"]}')
+                lines.append(f"{self.name}_sum{{{label_text}}} {series['sum']:.6f}")
+                lines.append(f"{self.name}_count{{{label_text}}} {series['count']}")
+        return "\n".join(lines)
+
+
+REQUEST_LATENCY = Histogram(
+    "smartroutes_request_duration_seconds",
+    "Route request latency by algorithm and number of locations.",
+    ("algorithm", "n"),
+)
+STAGE_LATENCY = Histogram(
+    "smartroutes_stage_duration_seconds",
+    "Time spent per request stage (fetch, parse, solve, improve, serialize) by algorithm.",
+    ("algorithm", "stage"),
+)
+
+
+def observe_request(timer):
+    REQUEST_LATENCY.observe((timer.algorithm, size_bucket(timer.n)), timer.elapsed())
+    for name, ms in timer.stages.items():
+        STAGE_LATENCY.observe((timer.algorithm, name), ms / 1000)
+
+
+def render_metrics():
+    """
+    :return: All metrics in the Prometheus text exposition format
+    """
+    return "\n".join(histogram.render() for histogram in (REQUEST_LATENCY, STAGE_LATENCY)) + "\n"
@@ -0,0 +1,170 @@
+import os
+
+import numpy as np
+
+from metrics import label_request, stage
+from src.local_search import local_search
+
+# Registered solvers: name -> solver(distances, data) returning (tsp_order, extra response fields)
+SOLVERS = {}
+
+
+def register_solver(name):
+    def decorator(solver):
+        SOLVERS[name] = solver
+        return solver
+    return decorator
+
+
+def parse_distance_matrix(rows, locations=None):
+    """
+    Parses Distance Matrix rows into compact distance and duration arrays in one pass.
+    :param rows: List of {"elements": [...]} rows as returned by get_distance_matrix
+    :param locations: Location names in row order, used to name the pair of a failed element
+    :return: (distances, durations) as contiguous int32 (n x n) arrays
+    """
+    n = len(rows)
+    try:
+        values = np.array(
+            [(element["distance"]["value"], element["duration"]["value"]) for row in rows for element in row["elements"]],
+            dtype=np.int32,
+        ).reshape(n, n, 2)
+    except KeyError:
+        raise_failed_element(rows, locations)
+        raise
+    return np.ascontiguousarray(values[..., 0]), np.ascontiguousarray(values[..., 1])
+
+
+def raise_failed_element(rows, locations=None):
+    """
+    Raises for the first element whose status is not OK (e.g. NOT_FOUND, ZERO_RESULTS).
+    """
+    for i, row in enumerate(rows):
+        for j, element in enumerate(row["elements"]):
+            status = element.get("status", "OK")
+            if status != "OK" or "distance" not in element:
+                origin, destination = (locations[i], locations[j]) if locations else (i, j)
+                raise Exception(f"No route from '{origin}' to '{destination}': {status}")
+
+
+# Optional post-optimization shared by every route: "improve": "2opt" | "oropt" | "2opt+oropt"
+IMPROVEMENTS = {
+    "2opt": ("2opt",),
+    "oropt": ("oropt",),
+    "2opt+oropt": ("2opt", "oropt"),
+}
+DEFAULT_IMPROVE_BUDGET_MS = int(os.getenv("IMPROVE_BUDGET_MS", 2000))
+
+
+def improve_tour(data, tsp_order, distances, progress=None):
+    method = data.get("improve")
+    if not method:
+        return tsp_order, None
+    if method not in IMPROVEMENTS:
+        raise Exception(f"Unknown improvement '{method}', expected one of {', '.join(IMPROVEMENTS)}")
+
+    tour, stats = local_search(
+        tsp_order,
+        distances,
+        moves=IMPROVEMENTS[method],
+        time_budget_ms=data.get("timeBudgetMs", DEFAULT_IMPROVE_BUDGET_MS),
+        progress=progress,
+    )
+    return tour, {
+        "method": method,
+        "distanceBefore": stats["distance_before"],
+        "distanceAfter": stats["distance_after"],
+        "iterations": stats["iterations"],
+        "elapsedMs": round(stats["elapsed_ms"], 2),
+    }
+
+
+def build_response(locations, tsp_order, distances, durations, extra=None):
+    """
+    Computes leg and total metrics with fancy indexing and assembles the JSON body.
+    """
+    order = np.asarray(tsp_order)
+    leg_distances = distances[order[:-1], order[1:]]
+    leg_durations = durations[order[:-1], order[1:]]
+    ordered_locations = [locations[i] for i in tsp_order]
+
+    response = {
+        "success": True,
+        "orderedLocations": ordered_locations,
+        "totalDistance": int(leg_distances.sum(dtype=np.int64)),
+        "totalDuration": int(leg_durations.sum(dtype=np.int64)),
+        "travelDetails": [
+            {"from": start, "to": end, "distance": distance, "duration": duration}
+            for start, end, distance, duration in zip(
+                ordered_locations, ordered_locations[1:], leg_distances.tolist(), leg_durations.tolist()
+            )
+        ],
+    }
+    if extra:
+        response.update(extra)
+    return response
+
+
+def load_matrices(data, fetch_matrix, fix_start):
+    """
+    Validates the request locations, inserts the depot and fetches the parsed matrices.
+    :return: (locations, distances, durations, degraded) where degraded means some distances are estimates
+    """
+    locations = list(data.get("locations") or [])
+    if fix_start not in locations:
+        locations.insert(0, fix_start)
+    if len(locations) < 2:
+        raise Exception("At least two locations are required")
+
+    label_request(n=len(locations))
+    with stage("fetch"):
+        rows = fetch_matrix(locations)
+    with stage("parse"):
+        distances, durations = parse_distance_matrix(rows, locations)
+    return locations, distances, durations, is_degraded(rows)
+
+
+def is_degraded(rows):
+    return any(row.get("estimated") for row in rows)
+
+
+def solve_route(algo, data, fetch_matrix, fix_start):
+    """
+    Runs one request through the pipeline: fetch, parse once, solve, improve, serialize.
+    :param algo: Name of a registered solver
+    :param data: Request JSON ("locations" plus solver and improvement options)
+    :param fetch_matrix: Callable returning Distance Matrix rows for a list of locations
+    :param fix_start: Depot address inserted first when missing
+    :return: Response dict
+    """
+    if algo not in SOLVERS:
+        raise Exception(f"Unknown algorithm '{algo}', expected one of {', '.join(SOLVERS)}")
+
+    label_request(algorithm=algo)
+    locations, distances, durations, degraded = load_matrices(data, fetch_matrix, fix_start)
+    return solve_matrices(algo, data, locations, distances, durations, degraded=degraded)
+
+
+def solve_matrices(algo, data, locations, distances, durations, progress=None, degraded=False):
+    """
+    Solves, improves and serializes one route from already parsed matrices.
+    :param progress: Optional callback(tsp_order, total_distance, iterations) for the best tour so far
+    :param degraded: Marks the response when the matrices hold estimated distances
+    """
+    with stage("solve"):
+        tsp_order, extra = SOLVERS[algo](distances, data)
+    if not tsp_order or len(tsp_order) < 2:
+        raise Exception("Invalid data for TSP calculation")
+    if progress is not None:
+        order = np.asarray(tsp_order)
+        progress(tsp_order, distances[order[:-1], order[1:]].sum().item(), 0)
+    with stage("improve"):
+        tsp_order, improvement = improve_tour(data, tsp_order, distances, progress)
+
+    with stage("serialize"):
+        response = build_response(locations, tsp_order, distances, durations, extra)
+    if improvement:
+        response["improvement"] = improvement
+    if degraded:
+        response["degraded"] = True
+    return response
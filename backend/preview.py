@@ -0,0 +1,43 @@
+import numpy as np
+
+from metrics import label_request, stage
+from src.distances import paired_distances
+from src.hilbert import hilbert_tour
+
+
+def hilbert_preview(data, geocode_many, fix_start):
+    """
+    Instant route preview from geocoded coordinates in Hilbert curve order, without the Distance Matrix API.
+    Distances are straight-line metres, so the response is flagged "estimated".
+    :param data: {"locations": [...]}
+    :param geocode_many: Callable(addresses) -> {address: (lat, lng)}
+    :param fix_start: Depot address inserted first when missing
+    :return: Response dict with the ordered locations and their coordinates
+    """
+    locations = list(data.get("locations") or [])
+    if fix_start not in locations:
+        locations.insert(0, fix_start)
+    if len(locations) < 2:
+        raise Exception("At least two locations are required")
+    label_request(algorithm="hilbert", n=len(locations))
+
+    with stage("fetch"):
+        coordinates = geocode_many(locations)
+    coords = np.array([coordinates[location] for location in locations], dtype=np.float64)
+    with stage("solve"):
+        path, total = hilbert_tour(coords, start=locations.index(fix_start), metric="haversine")
+
+    with stage("serialize"):
+        ordered = [locations[i] for i in path]
+        legs = paired_distances(coords[path[:-1]], coords[path[1:]], "haversine")
+        return {
+            "success": True,
+            "orderedLocations": ordered,
+            "coordinates": coords[path].tolist(),
+            "totalDistance": int(round(total)),
+            "travelDetails": [
+                {"from": start, "to": end, "distance": int(round(distance))}
+                for start, end, distance in zip(ordered, ordered[1:], legs.tolist())
+            ],
+            "estimated": True,
+        }
@@ -0,0 +1,147 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from metrics import label_request, stage
+from pipeline import SOLVERS, build_response, improve_tour, load_matrices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RACE_ALGORITHMS = ("greedy", "kruskal", "prim")
+DEFAULT_DEADLINE_MS = 5000
+# Pool size per server process. The deadline bounds the improvement phase, but a base solve cannot be
+# interrupted: a solver still running at the deadline keeps its worker until it returns, and later
+# /best and /vrp requests queue behind it once the pool is full. gunicorn.conf.py shares the CPUs
+# out across its workers; a single process gets all of them, and never fewer than one default race.
+RACE_WORKERS = int(os.getenv("RACE_WORKERS", max(len(DEFAULT_RACE_ALGORITHMS), os.cpu_count() or 1)))
+
+_executor = None
+_executor_pid = None
+
+
+def start_executor():
+    """
+    Creates the worker pool and forks its processes right away. Call it once app.py has registered
+    the solvers (the workers inherit the registry) and before the server starts request threads,
+    since forking a threaded process can copy locks held by the other threads.
+    """
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        # Resource tracker first, so the workers share it with this process
+        resource_tracker.ensure_running()
+        _executor = ProcessPoolExecutor(max_workers=RACE_WORKERS, mp_context=multiprocessing.get_context("fork"))
+        _executor_pid = os.getpid()
+        # A fork context pool starts all its processes on the first submit
+        _executor.submit(int).result()
+    return _executor
+
+
+def get_executor():
+    # Started at server startup; scripts and benchmarks get it on first use
+    return start_executor()
+
+
+def attach_shared(name):
+    """
+    Attaches to the shared memory block created by the request process.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always tracks, harmless here since forked workers share the parent's tracker
+        return shared_memory.SharedMemory(name=name)
+
+
+def race_worker(algo, shm_name, shape, dtype, data, deadline):
+    """
+    Runs one solver (and the requested improvement) on the shared distance matrix.
+    :return: List of (label, tsp_order, total_distance, elapsed_ms) candidates
+    """
+    shm = attach_shared(shm_name)
+    try:
+        distances = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        started = time.perf_counter()
+        tsp_order, _ = SOLVERS[algo](distances, data)
+        order = np.asarray(tsp_order)
+        candidates = [(algo, tsp_order, int(distances[order[:-1], order[1:]].sum()),
+                       (time.perf_counter() - started) * 1000)]
+
+        if data.get("improve"):
+            remaining_ms = max((deadline - time.time()) * 1000, 0)
+            budget = min(data.get("timeBudgetMs", remaining_ms), remaining_ms)
+            improved, improvement = improve_tour({**data, "timeBudgetMs": budget}, tsp_order, distances)
+            candidates.append((f"{algo}+{data['improve']}", improved, int(improvement["distanceAfter"]),
+                               (time.perf_counter() - started) * 1000))
+        del distances, order
+        return candidates
+    finally:
+        shm.close()
+
+
+def race_solvers(data, fetch_matrix, fix_start):
+    """
+    Fetches the matrix once, runs several solvers in parallel processes on a shared copy
+    and returns the shortest tour found before the caller's deadline.
+    :param data: Request JSON; "algorithms" and "deadlineMs" are optional
+    :return: Response dict with the winning route and a per-solver report
+    """
+    algorithms = data.get("algorithms") or list(DEFAULT_RACE_ALGORITHMS)
+    unknown = [algo for algo in algorithms if algo not in SOLVERS]
+    if unknown:
+        raise Exception(f"Unknown algorithms {unknown}, expected any of {', '.join(SOLVERS)}")
+    deadline_ms = data.get("deadlineMs", DEFAULT_DEADLINE_MS)
+    label_request(algorithm="best")
+
+    locations, distances, durations, degraded = load_matrices(data, fetch_matrix, fix_start)
+    deadline = time.time() + deadline_ms / 1000
+
+    shm = shared_memory.SharedMemory(create=True, size=max(distances.nbytes, 1))
+    try:
+        shared = np.ndarray(distances.shape, dtype=distances.dtype, buffer=shm.buf)
+        shared[:] = distances
+        del shared
+
+        with stage("solve"):
+            executor = get_executor()
+            futures = {
+                executor.submit(race_worker, algo, shm.name, distances.shape, distances.dtype.str, data, deadline): algo
+                for algo in algorithms
+            }
+            done, pending = wait(futures, timeout=max(deadline - time.time(), 0))
+            overrun = [futures[future] for future in pending if not future.cancel()]
+            if overrun:
+                logger.warning("Solvers %s still running after %d ms, their workers stay busy until they return",
+                               overrun, deadline_ms)
+    finally:
+        # Workers still running keep their own mapping, the name is released now
+        shm.close()
+        shm.unlink()
+
+    report = []
+    candidates = []
+    for future, algo in futures.items():
+        if future not in done:
+            report.append({"algorithm": algo, "finished": False})
+            continue
+        if future.exception() is not None:
+            report.append({"algorithm": algo, "finished": False, "error": str(future.exception())})
+            continue
+        for label, tsp_order, total_distance, elapsed_ms in future.result():
+            report.append({"algorithm": label, "finished": True, "totalDistance": total_distance,
+                           "elapsedMs": round(elapsed_ms, 2)})
+            candidates.append((total_distance, label, tsp_order))
+
+    if not candidates:
+        return {"success": False, "message": f"No solver finished within {deadline_ms} ms", "race": report}
+
+    _, winner, tsp_order = min(candidates, key=lambda candidate: candidate[0])
+    extra = {"algorithm": winner, "race": report}
+    if degraded:
+        extra["degraded"] = True
+    with stage("serialize"):
+        return build_response(locations, tsp_order, distances, durations, extra)
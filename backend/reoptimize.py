@@ -0,0 +1,85 @@
+import os
+
+from metrics import label_request, stage
+from pipeline import build_response, is_degraded, parse_distance_matrix
+from src.insertion import cheapest_insertion
+from src.local_search import local_search, tour_length
+
+REOPTIMIZE_BUDGET_MS = int(os.getenv("REOPTIMIZE_BUDGET_MS", 200))
+
+
+def reoptimize_route(data, fetch_matrix, fix_start):
+    """
+    Updates a previously solved route after stops were added or cancelled, without re-solving.
+    Cancelled stops are cut out and their neighbours joined, new stops are placed by cheapest
+    insertion, then a 2-opt repair runs around the touched stops only, within a small budget.
+    The previous route's pairs come from the distance cache, so only the new stops' rows and
+    columns reach the Distance Matrix API.
+    :param data: {"orderedLocations": [...previous route...], "add": [...], "remove": [...]}
+    :param fetch_matrix: Callable returning Distance Matrix rows for a list of locations
+    :param fix_start: Depot address, always kept first
+    :return: Response dict with the updated route and a "reoptimization" report
+    """
+    previous = [location for location in dict.fromkeys(data.get("orderedLocations") or []) if location != fix_start]
+    added = list(dict.fromkeys(data.get("add") or []))
+    removed = set(data.get("remove") or [])
+    if not previous and not added:
+        raise Exception("orderedLocations from a previous solve are required")
+    unknown = removed - set(previous)
+    if unknown:
+        raise Exception(f"Cannot remove locations that are not on the route: {sorted(unknown)}")
+    duplicates = [location for location in added if location in previous or location == fix_start]
+    if duplicates:
+        raise Exception(f"Locations already on the route: {duplicates}")
+
+    # Index the kept stops in their previous order so the old tour is simply 0, 1, ..., 0
+    route = [fix_start] + previous
+    kept = [location for location in route if location not in removed]
+    locations = kept + added
+    label_request(algorithm="reoptimize", n=len(locations))
+    with stage("fetch"):
+        rows = fetch_matrix(locations)
+    with stage("parse"):
+        distances, durations = parse_distance_matrix(rows, locations)
+
+    index = {location: i for i, location in enumerate(kept)}
+    tour = list(range(len(kept))) + [0]
+    # Neighbours of cancelled stops now share a new edge
+    active = set()
+    for i, location in enumerate(route):
+        if location in removed:
+            active.update(loc for loc in (route[i - 1], route[(i + 1) % len(route)]) if loc in index)
+    active = {index[location] for location in active}
+
+    with stage("solve"):
+        for node in range(len(kept), len(locations)):
+            tour, _ = cheapest_insertion(tour, distances, node)
+            position = tour.index(node)
+            active.update((tour[position - 1], node, tour[position + 1]))
+
+    distance_before = tour_length(tour, distances)
+    stats = {"iterations": 0, "elapsed_ms": 0.0, "distance_after": distance_before}
+    if active and len(locations) >= 4:
+        with stage("improve"):
+            tour, stats = local_search(
+                tour,
+                distances,
+                moves=("2opt",),
+                time_budget_ms=data.get("timeBudgetMs", REOPTIMIZE_BUDGET_MS),
+                active=sorted(active),
+            )
+
+    extra = {
+        "reoptimization": {
+            "added": added,
+            "removed": sorted(removed),
+            "distanceBeforeRepair": distance_before,
+            "distanceAfter": stats["distance_after"],
+            "iterations": stats["iterations"],
+            "elapsedMs": round(stats["elapsed_ms"], 2),
+        }
+    }
+    if is_degraded(rows):
+        extra["degraded"] = True
+    with stage("serialize"):
+        return build_response(locations, tour, distances, durations, extra)
@@ -0,0 +1,94 @@
+"""
+Local stand-in for the Google Distance Matrix and Geocoding endpoints.
+
+Addresses are hashed to stable pseudo coordinates so responses are deterministic,
+and the provider's per-request limits are enforced so tiling can be verified offline:
+
+    python stub_distance_api.py --port 5002
+    DISTANCE_MATRIX_URL=http://localhost:5002/maps/api/distancematrix/json \
+    GEOCODE_URL=http://localhost:5002/maps/api/geocode/json python app.py
+"""
+import argparse
+import hashlib
+import math
+
+from flask import Flask, request, jsonify
+
+MAX_ORIGINS = 25
+MAX_DESTINATIONS = 25
+MAX_ELEMENTS = 100
+
+stub = Flask(__name__)
+stub.request_count = 0
+stub.element_count = 0
+
+
+def stub_coordinates(address):
+    """
+    Maps an address to stable (x, y) metres inside a 20 km square.
+    """
+    digest = hashlib.sha1(address.encode("utf-8")).digest()
+    x = int.from_bytes(digest[:4], "big") % 20000
+    y = int.from_bytes(digest[4:8], "big") % 20000
+    return x, y
+
+
+def stub_element(origin, destination):
+    x1, y1 = stub_coordinates(origin)
+    x2, y2 = stub_coordinates(destination)
+    distance = int(round(math.hypot(x1 - x2, y1 - y2)))
+    # Roughly 40 km/h in town
+    return {
+        "status": "OK",
+        "distance": {"text": f"{distance / 1000:.1f} km", "value": distance},
+        "duration": {"text": f"{distance // 667} mins", "value": int(distance / 11.1)},
+    }
+
+
+@stub.route("/maps/api/distancematrix/json", methods=["GET"])
+def distance_matrix():
+    origins = [o for o in request.args.get("origins", "").split("|") if o]
+    destinations = [d for d in request.args.get("destinations", "").split("|") if d]
+
+    if not origins or not destinations:
+        return jsonify({"status": "INVALID_REQUEST", "rows": []})
+    if len(origins) > MAX_ORIGINS or len(destinations) > MAX_DESTINATIONS:
+        return jsonify({"status": "MAX_DIMENSIONS_EXCEEDED", "rows": []})
+    if len(origins) * len(destinations) > MAX_ELEMENTS:
+        return jsonify({"status": "MAX_ELEMENTS_EXCEEDED", "rows": []})
+
+    stub.request_count += 1
+    stub.element_count += len(origins) * len(destinations)
+    return jsonify({
+        "status": "OK",
+        "origin_addresses": origins,
+        "destination_addresses": destinations,
+        "rows": [{"elements": [stub_element(o, d) for d in destinations]} for o in origins],
+    })
+
+
+@stub.route("/maps/api/geocode/json", methods=["GET"])
+def geocode():
+    address = request.args.get("address", "")
+    if not address:
+        return jsonify({"status": "INVALID_REQUEST", "results": []})
+    # Place the pseudo coordinates south-west of downtown San Jose
+    x, y = stub_coordinates(address)
+    lat = 37.25 + y / 111320
+    lng = -121.95 + x / (111320 * math.cos(math.radians(lat)))
+    return jsonify({
+        "status": "OK",
+        "results": [{"formatted_address": address, "geometry": {"location": {"lat": lat, "lng": lng}}}],
+    })
+
+
+@stub.route("/stats", methods=["GET"])
+def stats():
+    return jsonify({"requests": stub.request_count, "elements": stub.element_count})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Distance Matrix stub")
+    parser.add_argument("--port", type=int, default=5002)
+    args = parser.parse_args()
+    stub.run(host="127.0.0.1", port=args.port, threaded=True)
@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+
+from metrics import label_request, stage
+from pipeline import DEFAULT_IMPROVE_BUDGET_MS, IMPROVEMENTS, build_response, load_matrices
+from src.cvrp import solve_cvrp
+
+VRP_IMPROVE = os.getenv("VRP_IMPROVE", "2opt+oropt")
+
+
+def solve_vrp(data, fetch_matrix, fix_start, executor=None):
+    """
+    Splits the stops across vehicles from the depot with Clarke-Wright savings, then improves
+    every vehicle's route, in parallel when an executor is given.
+    :param data: {"locations": [...], "demands": [...], "capacity": 10, "maxDuration": seconds,
+                  "vehicles": optional fleet size, "improve": "2opt+oropt" or "" to skip, "timeBudgetMs": per route}
+    :param fetch_matrix: Callable returning Distance Matrix rows for a list of locations
+    :param fix_start: Depot address
+    :param executor: Optional concurrent.futures executor for the per-route improvement
+    :return: Response dict with one entry per vehicle route
+    """
+    label_request(algorithm="vrp")
+    requested = list(data.get("locations") or [])
+    capacity = data.get("capacity")
+    if capacity is None or capacity <= 0:
+        raise Exception("A positive vehicle capacity is required")
+    demands = data.get("demands")
+    if demands is None:
+        demands = [1] * len(requested)
+    if len(demands) != len(requested):
+        raise Exception(f"Expected {len(requested)} demands, one per location, got {len(demands)}")
+    too_big = [location for location, demand in zip(requested, demands) if demand > capacity]
+    if too_big:
+        raise Exception(f"Demand of {too_big} exceeds the vehicle capacity {capacity}")
+    method = data.get("improve", VRP_IMPROVE)
+    if method and method not in IMPROVEMENTS:
+        raise Exception(f"Unknown improvement '{method}', expected one of {', '.join(IMPROVEMENTS)}")
+
+    locations, distances, durations, degraded = load_matrices(data, fetch_matrix, fix_start)
+    depot = locations.index(fix_start)
+    demand_of = dict(zip(requested, demands))
+    node_demands = np.array([0 if location == fix_start else demand_of[location] for location in locations])
+
+    with stage("solve"):
+        routes = solve_cvrp(
+            distances, node_demands, capacity, depot,
+            durations=durations,
+            max_duration=data.get("maxDuration"),
+            moves=IMPROVEMENTS[method] if method else (),
+            time_budget_ms=data.get("timeBudgetMs", DEFAULT_IMPROVE_BUDGET_MS),
+            executor=executor,
+        )
+    vehicles = data.get("vehicles")
+    if vehicles is not None and len(routes) > vehicles:
+        raise Exception(f"The stops need {len(routes)} vehicles but only {vehicles} are available")
+
+    with stage("serialize"):
+        vehicle_routes = []
+        for vehicle, route in enumerate(routes):
+            response = build_response(locations, [depot] + route + [depot], distances, durations,
+                                      {"vehicle": vehicle, "load": node_demands[route].sum().item()})
+            del response["success"]
+            vehicle_routes.append(response)
+
+    response = {
+        "success": True,
+        "routes": vehicle_routes,
+        "vehicles": len(vehicle_routes),
+        "totalDistance": sum(route["totalDistance"] for route in vehicle_routes),
+        "totalDuration": sum(route["totalDuration"] for route in vehicle_routes),
+    }
+    if degraded:
+        response["degraded"] = True
+    return response
@@ -0,0 +1,73 @@
+import numpy as np
+
+from metrics import label_request, stage
+from pipeline import build_response, load_matrices
+from src.time_windows import time_window_insertion
+
+OBJECTIVES = ("distance", "duration")
+
+
+def solve_time_windows(data, fetch_matrix, fix_start):
+    """
+    Builds a route that meets per-stop delivery windows, with arrival times at every stop.
+    Times are seconds on any clock the caller picks, e.g. seconds since midnight.
+    :param data: {"locations": [...], "timeWindows": [[earliest, latest] or null, ...],
+                  "serviceTimes": [...] or one number, "shiftStart": 0, "shiftEnd": optional,
+                  "minimize": "distance" | "duration"}
+    :return: Response dict with the route, a per-stop "schedule" and the "unassigned" stops
+    """
+    label_request(algorithm="timewindows")
+    requested = list(data.get("locations") or [])
+    time_windows = data.get("timeWindows") or [None] * len(requested)
+    if len(time_windows) != len(requested):
+        raise Exception(f"Expected {len(requested)} time windows, one per location, got {len(time_windows)}")
+    service_times = data.get("serviceTimes", 0)
+    if not isinstance(service_times, list):
+        service_times = [service_times] * len(requested)
+    if len(service_times) != len(requested):
+        raise Exception(f"Expected {len(requested)} service times, one per location, got {len(service_times)}")
+    minimize = data.get("minimize", "distance")
+    if minimize not in OBJECTIVES:
+        raise Exception(f"Unknown objective '{minimize}', expected one of {', '.join(OBJECTIVES)}")
+
+    locations, distances, durations, degraded = load_matrices(data, fetch_matrix, fix_start)
+    depot = locations.index(fix_start)
+    window_of = dict(zip(requested, time_windows))
+    service_of = dict(zip(requested, service_times))
+    shift_start = data.get("shiftStart", 0)
+    shift_end = data.get("shiftEnd")
+
+    windows = np.empty((len(locations), 2), dtype=np.float64)
+    service = np.zeros(len(locations), dtype=np.float64)
+    for i, location in enumerate(locations):
+        if i == depot:
+            windows[i] = (shift_start, np.inf if shift_end is None else shift_end)
+            continue
+        window = window_of.get(location)
+        windows[i] = (-np.inf, np.inf) if window is None else window
+        service[i] = service_of.get(location, 0)
+    if (windows[:, 0] > windows[:, 1]).any():
+        raise Exception("Every time window must have earliest <= latest")
+
+    with stage("solve"):
+        tour, arrival, start, unassigned = time_window_insertion(
+            durations, windows, service, depot, costs=distances if minimize == "distance" else durations
+        )
+
+    with stage("serialize"):
+        extra = {
+            "schedule": [
+                {
+                    "location": locations[node],
+                    "arrival": round(float(arrive), 1),
+                    "serviceStart": round(float(begin), 1),
+                    "wait": round(float(begin - arrive), 1),
+                    "departure": round(float(begin + service[node]), 1),
+                }
+                for node, arrive, begin in zip(tour, arrival, start)
+            ],
+            "unassigned": [locations[node] for node in unassigned],
+        }
+        if degraded:
+            extra["degraded"] = True
+        return build_response(locations, tour, distances, durations, extra)
@@ -0,0 +1,47 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.christofides import christofides_tsp
+from src.distances import distance_matrix
+from src.held_karp import held_karp_tsp
+from src.heuristics import TOUR_HEURISTICS
+
+
+def tour_cost(path, distances):
+    return distances[path[:-1], path[1:]].sum().item()
+
+
+SOLVERS = {
+    **TOUR_HEURISTICS,
+    "christofides": lambda d: christofides_tsp(d, 0)[0],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Approximation ratio of the heuristics against Held-Karp")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 12, 16])
+    parser.add_argument("--instances", type=int, default=20, help="Random instances per size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'n':>4} {'exact ms':>9} " + " ".join(f"{name + ' mean/max':>22}" for name in SOLVERS))
+    for n in args.sizes:
+        ratios = {name: [] for name in SOLVERS}
+        exact_time = 0.0
+        for _ in range(args.instances):
+            distances = distance_matrix(rng.random((n, 2)) * 10000)
+            start = time.perf_counter()
+            _, optimum = held_karp_tsp(distances, 0, max_n=n)
+            exact_time += time.perf_counter() - start
+            for name, solve in SOLVERS.items():
+                ratios[name].append(tour_cost(solve(distances), distances) / optimum)
+
+        cells = " ".join(f"{np.mean(r):>13.3f}/{np.max(r):<8.3f}" for r in ratios.values())
+        print(f"{n:>4} {exact_time / args.instances * 1000:>9.2f} {cells}")
+
+
+if __name__ == "__main__":
+    main()
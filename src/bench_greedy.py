@@ -0,0 +1,98 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.instance_format import load_instance
+from src.nearest_neighbor import nearest_neighbor_tour
+
+
+def list_greedy(distances):
+    """
+    Previous backend solve_tsp_greedy: builds a list of candidates at every step.
+    """
+    n = len(distances)
+    visited = [False] * n
+    path = [0]
+    visited[0] = True
+    for _ in range(n - 1):
+        last = path[-1]
+        next_point = min(
+            [(i, distances[last][i]) for i in range(n) if not visited[i]],
+            key=lambda x: x[1],
+        )[0]
+        path.append(next_point)
+        visited[next_point] = True
+    path.append(0)
+    return path
+
+
+def scan_greedy(distances):
+    """
+    Previous src greedy_tsp: scans the NumPy matrix element by element.
+    """
+    n = distances.shape[0]
+    visited = [False] * n
+    path = [0]
+    visited[0] = True
+    current = 0
+    for _ in range(n - 1):
+        nearest = None
+        min_distance = float('inf')
+        for i in range(n):
+            if not visited[i] and distances[current][i] < min_distance:
+                nearest = i
+                min_distance = distances[current][i]
+        path.append(nearest)
+        visited[nearest] = True
+        current = nearest
+    path.append(0)
+    return path
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nearest-neighbour engine benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--skip-baseline", action="store_true", help="Only time the vectorized engine")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--instance", help="Benchmark a binary instance file with a stored matrix instead")
+    args = parser.parse_args()
+
+    if args.instance:
+        instance = load_instance(args.instance)
+        if instance.distances is None:
+            parser.error(f"{args.instance} has no stored distance matrix, convert it with --matrix")
+        (path, total), engine_time = timed(nearest_neighbor_tour, instance.distances, 0)
+        print(f"{instance.name or args.instance}: n={len(path) - 1} length={total:.0f} engine {engine_time:.3f} s")
+        return
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'n':>7} {'list (s)':>10} {'scan (s)':>10} {'engine (s)':>11} {'speedup':>9}")
+    for n in args.sizes:
+        coords = rng.random((n, 2), dtype=np.float32) * 10000
+        diff = coords[:, None, :] - coords[None, :, :]
+        distances = np.sqrt((diff ** 2).sum(axis=2), dtype=np.float32)
+        del diff
+
+        (path, _), engine_time = timed(nearest_neighbor_tour, distances, 0)
+
+        if args.skip_baseline:
+            print(f"{n:>7} {'-':>10} {'-':>10} {engine_time:>11.3f} {'-':>9}")
+            continue
+
+        as_lists = distances.tolist()
+        list_path, list_time = timed(list_greedy, as_lists)
+        scan_path, scan_time = timed(scan_greedy, distances)
+        assert list_path == path and scan_path == path
+        speedup = min(list_time, scan_time) / engine_time
+        print(f"{n:>7} {list_time:>10.3f} {scan_time:>10.3f} {engine_time:>11.3f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
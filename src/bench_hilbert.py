@@ -0,0 +1,53 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.distances import distance_matrix
+from src.heuristics import TOUR_HEURISTICS
+from src.hilbert import hilbert_tour
+
+# Matrix based solvers; their times include building the matrix, which Hilbert never needs
+SOLVERS = TOUR_HEURISTICS
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hilbert curve tour against the matrix based heuristics")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--large", type=int, nargs="*", default=[100000, 1000000],
+                        help="Sizes run with the Hilbert tour only")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    header = " ".join(f"{name + ' s/ratio':>18}" for name in SOLVERS)
+    print(f"{'n':>8} {'hilbert (s)':>12} {'matrix (s)':>11} {header}")
+    for n in args.sizes:
+        coords = rng.random((n, 2)) * 10000
+        (_, hilbert_length), hilbert_time = timed(hilbert_tour, coords)
+        distances, matrix_time = timed(distance_matrix, coords)
+
+        cells = []
+        for solve in SOLVERS.values():
+            path, solve_time = timed(solve, distances)
+            path = np.asarray(path)
+            length = distances[path[:-1], path[1:]].sum()
+            # Ratio > 1 means the Hilbert tour is longer
+            cells.append(f"{matrix_time + solve_time:>10.3f}/{hilbert_length / length:<7.3f}")
+        del distances
+        print(f"{n:>8} {hilbert_time:>12.4f} {matrix_time:>11.3f} " + " ".join(cells))
+
+    for n in args.large:
+        coords = rng.random((n, 2)) * 10000
+        _, hilbert_time = timed(hilbert_tour, coords)
+        print(f"{n:>8} {hilbert_time:>12.4f} {'-':>11} " + " ".join(f"{'-':>18}" for _ in SOLVERS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import resource
+import time
+
+import numpy as np
+
+from src.distances import distance_matrix
+from src.heuristics import TOUR_HEURISTICS
+from src.local_search import local_search
+from src.nearest_neighbor import nearest_neighbor_tour
+from src.partition import DEFAULT_MAX_CLUSTER_SIZE, cluster_tour, path_length
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Divide and conquer tours on large random instances")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 50000])
+    parser.add_argument("--cluster-size", type=int, default=DEFAULT_MAX_CLUSTER_SIZE)
+    parser.add_argument("--solver", default="greedy", choices=list(TOUR_HEURISTICS))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--full-max", type=int, default=5000,
+                        help="Also solve instances up to this size on the full matrix for comparison")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'n':>7} {'clustered (s)':>14} {'length':>12} {'full (s)':>9} {'full length':>12} {'gap %':>7}")
+    for n in args.sizes:
+        coords = rng.random((n, 2)) * 100000
+        start = time.perf_counter()
+        tour, length = cluster_tour(coords, args.cluster_size, args.solver, workers=args.workers)
+        clustered_time = time.perf_counter() - start
+        assert len(tour) == n + 1 and len(set(tour)) == n
+
+        if n > args.full_max:
+            print(f"{n:>7} {clustered_time:>14.2f} {length:>12.0f} {'-':>9} {'-':>12} {'-':>7}")
+            continue
+        start = time.perf_counter()
+        distances = distance_matrix(coords, dtype=np.float32)
+        full, _ = local_search(nearest_neighbor_tour(distances, 0)[0], distances)
+        full_time = time.perf_counter() - start
+        full_length = path_length(full, coords)
+        del distances
+        print(f"{n:>7} {clustered_time:>14.2f} {length:>12.0f} {full_time:>9.2f} {full_length:>12.0f} "
+              f"{(length - full_length) / full_length * 100:>7.2f}")
+
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(f"Peak RSS of a cluster worker: {children:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
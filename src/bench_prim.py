@@ -0,0 +1,69 @@
+import argparse
+import heapq
+import time
+import tracemalloc
+from collections import defaultdict
+
+import numpy as np
+
+from src.distances import distance_matrix
+from src.prim import prim_mst
+
+
+def heap_prim_mst(distances):
+    """
+    Previous backend prim_mst: lazy-deletion binary heap over the dense matrix.
+    """
+    n = len(distances)
+    mst = defaultdict(list)
+    visited = [False] * n
+    min_heap = [(0, 0, -1)]
+    while min_heap:
+        weight, u, v = heapq.heappop(min_heap)
+        if visited[u]:
+            continue
+        visited[u] = True
+        if v != -1:
+            mst[u].append(v)
+            mst[v].append(u)
+        for v in range(n):
+            if not visited[v] and distances[u][v] > 0:
+                heapq.heappush(min_heap, (distances[u][v], v, u))
+    return mst
+
+
+def tree_weight(mst, distances):
+    return sum(distances[u][v] for u in mst for v in mst[u]) / 2
+
+
+def measure(func, distances):
+    tracemalloc.start()
+    start = time.perf_counter()
+    mst = func(distances)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return mst, elapsed, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dense Prim vs heap Prim benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'n':>6} {'heap (s)':>9} {'heap MiB':>9} {'dense (s)':>10} {'dense MiB':>10} {'speedup':>8}")
+    for n in args.sizes:
+        distances = distance_matrix(rng.random((n, 2)) * 10000).round().astype(np.int32)
+        as_lists = distances.tolist()
+
+        heap_tree, heap_time, heap_peak = measure(heap_prim_mst, as_lists)
+        dense_tree, dense_time, dense_peak = measure(prim_mst, distances)
+        assert abs(tree_weight(heap_tree, as_lists) - tree_weight(dense_tree, as_lists)) < 1e-6
+        print(f"{n:>6} {heap_time:>9.3f} {heap_peak:>9.1f} {dense_time:>10.3f} {dense_peak:>10.2f} "
+              f"{heap_time / dense_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
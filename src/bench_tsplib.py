@@ -0,0 +1,200 @@
+"""
+Benchmark suite over TSPLIB instances: wall time, peak memory and gap to the known optimum
+for every solver in src/ and every solver registered by backend/app.py.
+
+    python -m src.bench_tsplib
+    python -m src.bench_tsplib --instances berlin52 rand200 --baseline results/baseline.json
+
+Instances are read from data/tsplib/*.tsp (or binary .inst files from src.instance_format).
+Reports are written to results/bench_tsplib.csv and results/bench_tsplib.json. With --baseline,
+the run exits non-zero when a solver got slower than --tolerance times the baseline or its
+gap grew, so CI can catch regressions.
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.christofides import christofides_tsp
+from src.held_karp import HELD_KARP_MAX_N, held_karp_tsp
+from src.heuristics import TOUR_HEURISTICS
+from src.instance_format import load_instance
+from src.kruskal import kruskal_mst_knn, krustral_tsp
+from src.local_search import local_search
+from src.nearest_neighbor import nearest_neighbor_tour
+from src.tsplib import read_tsplib, tsplib_distance_matrix
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Known optimal tour lengths
+OPTIMA = {
+    "berlin52": 7542,
+    "kroA100": 21282,
+    "pr1002": 259045,
+    "rand16": 4113,
+}
+
+# name -> (solve(distances, coords) -> closed tour, largest n it is run on)
+SOLVERS = {
+    **{name: (lambda d, c, solve=solve: solve(d), None) for name, solve in TOUR_HEURISTICS.items()},
+    "kruskal_knn": (lambda d, c: krustral_tsp(kruskal_mst_knn(c), 0), None),
+    "christofides": (lambda d, c: christofides_tsp(d, 0)[0], None),
+    "held_karp": (lambda d, c: held_karp_tsp(d, 0)[0], HELD_KARP_MAX_N),
+    "greedy+2opt+oropt": (lambda d, c: local_search(nearest_neighbor_tour(d, 0)[0], d)[0], None),
+}
+
+
+def backend_solvers():
+    """
+    Solvers registered by backend/app.py, importing it with in-memory caches.
+    """
+    sys.path.append(os.path.join(ROOT, "backend"))
+    os.environ.setdefault("DISTANCE_CACHE_PATH", ":memory:")
+    os.environ.setdefault("GEOCODE_CACHE_PATH", ":memory:")
+    import app
+
+    def wrap(solver):
+        return lambda d, c: solver(d, {})[0]
+
+    return {f"backend:{name}": (wrap(solver), None) for name, solver in app.SOLVERS.items()}
+
+
+def load(path):
+    """
+    :return: (name, coords, distances) with TSPLIB integer distances as float64
+    """
+    if path.endswith(".inst"):
+        instance = load_instance(path)
+        distances = instance.distances
+        if distances is None:
+            distances = tsplib_distance_matrix(instance.coords, instance.metric, dtype=np.float64)
+        name = instance.name or os.path.splitext(os.path.basename(path))[0]
+        return name, np.asarray(instance.coords), np.asarray(distances, dtype=np.float64)
+    name, edge_weight_type, coords = read_tsplib(path)
+    name = name or os.path.splitext(os.path.basename(path))[0]
+    return name, coords, tsplib_distance_matrix(coords, edge_weight_type, dtype=np.float64)
+
+
+def check_tour(tour, n):
+    if len(tour) != n + 1 or tour[0] != tour[-1] or sorted(int(v) for v in tour[:-1]) != list(range(n)):
+        raise ValueError("solver returned an invalid tour")
+
+
+def run(solve, distances, coords, repeat):
+    """
+    Best wall time over `repeat` untraced runs, then one run under tracemalloc for peak memory.
+    :return: (tour, seconds, peak bytes)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tour = solve(distances, coords)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        solve(distances, coords)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return tour, best, peak
+
+
+def compare(rows, baseline_path, tolerance):
+    """
+    :return: List of regression messages against a previous JSON report
+    """
+    with open(baseline_path, "r") as file:
+        baseline = {(row["instance"], row["solver"]): row for row in json.load(file)}
+    regressions = []
+    for row in rows:
+        before = baseline.get((row["instance"], row["solver"]))
+        if before is None or row["error"] or before["error"]:
+            continue
+        if row["seconds"] > tolerance * before["seconds"] and row["seconds"] - before["seconds"] > 0.01:
+            regressions.append(f"{row['instance']}/{row['solver']}: {before['seconds']:.3f}s -> {row['seconds']:.3f}s")
+        if row["length"] > before["length"]:
+            regressions.append(f"{row['instance']}/{row['solver']}: length {before['length']} -> {row['length']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TSPLIB benchmark suite")
+    parser.add_argument("--data", default=os.path.join(ROOT, "data", "tsplib"))
+    parser.add_argument("--instances", nargs="+", help="Instance names to run, all files in --data by default")
+    parser.add_argument("--solvers", nargs="+", help="Solver names to run, all by default")
+    parser.add_argument("--no-backend", action="store_true", help="Skip the solvers registered by backend/app.py")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per solver, the best is reported")
+    parser.add_argument("--out", default=os.path.join(ROOT, "results", "bench_tsplib"),
+                        help="Report path without extension, .csv and .json are written")
+    parser.add_argument("--baseline", help="Previous JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed slowdown factor against the baseline")
+    args = parser.parse_args()
+
+    solvers = dict(SOLVERS)
+    if not args.no_backend:
+        solvers.update(backend_solvers())
+    if args.solvers:
+        solvers = {name: solvers[name] for name in args.solvers}
+
+    paths = sorted(glob.glob(os.path.join(args.data, "*.tsp")) + glob.glob(os.path.join(args.data, "*.inst")))
+    if args.instances:
+        paths = [p for p in paths if os.path.splitext(os.path.basename(p))[0] in args.instances]
+    if not paths:
+        parser.error(f"No instances found in {args.data}")
+
+    rows = []
+    print(f"{'instance':>10} {'n':>6} {'solver':>24} {'time (s)':>9} {'peak MB':>8} {'length':>10} {'gap %':>7}")
+    for path in paths:
+        name, coords, distances = load(path)
+        n = distances.shape[0]
+        optimum = OPTIMA.get(name)
+        for solver, (solve, max_n) in solvers.items():
+            if max_n is not None and n > max_n:
+                continue
+            row = {"instance": name, "n": n, "solver": solver, "seconds": None, "peak_bytes": None,
+                   "length": None, "optimum": optimum, "gap_percent": None, "error": None}
+            try:
+                tour, seconds, peak = run(solve, distances, coords, args.repeat)
+                check_tour(tour, n)
+                order = np.asarray(tour)
+                length = int(distances[order[:-1], order[1:]].sum())
+                row.update(seconds=round(seconds, 6), peak_bytes=peak, length=length)
+                if optimum:
+                    row["gap_percent"] = round((length - optimum) / optimum * 100, 3)
+            except Exception as e:
+                row["error"] = str(e)
+            rows.append(row)
+
+            if row["error"]:
+                print(f"{name:>10} {n:>6} {solver:>24} error: {row['error']}")
+            else:
+                gap = "-" if row["gap_percent"] is None else f"{row['gap_percent']:.2f}"
+                print(f"{name:>10} {n:>6} {solver:>24} {row['seconds']:>9.3f} "
+                      f"{row['peak_bytes'] / 2 ** 20:>8.2f} {row['length']:>10} {gap:>7}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out + ".csv", "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(args.out + ".json", "w") as file:
+        json.dump(rows, file, indent=2)
+    print(f"Wrote {args.out}.csv and {args.out}.json")
+
+    if args.baseline:
+        regressions = compare(rows, args.baseline, args.tolerance)
+        for message in regressions:
+            print(f"Regression: {message}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
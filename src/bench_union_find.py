@@ -0,0 +1,97 @@
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from src.distances import distance_matrix
+from src.kruskal import UnionFind, kruskal_mst
+
+
+class ListUnionFind:
+    """
+    Previous src UnionFind: Python lists, recursive find, union by rank.
+    """
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.rank = [0] * n
+
+    def find(self, u):
+        if self.parent[u] != u:
+            self.parent[u] = self.find(self.parent[u])
+        return self.parent[u]
+
+    def union(self, u, v):
+        root_u = self.find(u)
+        root_v = self.find(v)
+        if root_u != root_v:
+            if self.rank[root_u] > self.rank[root_v]:
+                self.parent[root_v] = root_u
+            elif self.rank[root_u] < self.rank[root_v]:
+                self.parent[root_u] = root_v
+            else:
+                self.parent[root_v] = root_u
+                self.rank[root_u] += 1
+            return True
+        return False
+
+
+def list_kruskal_mst(distances):
+    """
+    Previous kruskal_mst: Python edge list, tuple sort, every edge visited.
+    """
+    n = len(distances)
+    edges = []
+    for i in range(n):
+        for j in range(i + 1, n):
+            edges.append((distances[i][j], i, j))
+    edges.sort(key=lambda x: x[0])
+
+    uf = ListUnionFind(n)
+    mst = defaultdict(list)
+    for weight, u, v in edges:
+        if uf.union(u, v):
+            mst[u].append(v)
+            mst[v].append(u)
+    return mst
+
+
+def scalar_unions(uf, u, v):
+    for a, b in zip(u.tolist(), v.tolist()):
+        uf.union(a, b)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Union-find and Kruskal micro-benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--unions", type=int, default=1000000, help="Random unions for the raw union-find timing")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    n = max(args.sizes)
+    u = rng.integers(0, n, args.unions)
+    v = rng.integers(0, n, args.unions)
+    _, list_time = timed(scalar_unions, ListUnionFind(n), u, v)
+    _, array_time = timed(scalar_unions, UnionFind(n), u, v)
+    _, bulk_time = timed(UnionFind(n).union_edges, u, v)
+    print(f"{args.unions} random unions over {n} nodes: list {list_time:.3f} s, "
+          f"array {array_time:.3f} s, union_edges {bulk_time:.3f} s")
+
+    print(f"{'n':>6} {'edges':>9} {'previous (s)':>13} {'kruskal_mst (s)':>16} {'speedup':>8}")
+    for n in args.sizes:
+        distances = distance_matrix(rng.random((n, 2)) * 10000)
+        old, old_time = timed(list_kruskal_mst, distances)
+        new, new_time = timed(kruskal_mst, distances)
+        assert dict(old) == dict(new)
+        print(f"{n:>6} {n * (n - 1) // 2:>9} {old_time:>13.3f} {new_time:>16.3f} {old_time / new_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
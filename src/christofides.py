@@ -0,0 +1,166 @@
+import time
+from itertools import combinations
+
+import numpy as np
+
+from src.kruskal import kruskal_mst
+
+# Odd-vertex sets up to this size are matched exactly with a bitmask DP
+EXACT_MATCHING_THRESHOLD = 14
+
+
+def exact_matching(odd, weights):
+    """
+    Minimum-weight perfect matching by dynamic programming over subsets.
+    :param odd: List of vertices (even count)
+    :param weights: 2D numpy array of edge weights
+    :return: List of matched (u, v) pairs
+    """
+    m = len(odd)
+    w = weights[np.ix_(odd, odd)].tolist()
+    size = 1 << m
+    cost = [float('inf')] * size
+    choice = [-1] * size
+    cost[0] = 0.0
+
+    for mask in range(1, size):
+        if bin(mask).count("1") % 2:
+            continue
+        # Pair the lowest vertex of the subset with every other member
+        i = (mask & -mask).bit_length() - 1
+        rest = mask ^ (1 << i)
+        bits = rest
+        while bits:
+            j = (bits & -bits).bit_length() - 1
+            bits ^= 1 << j
+            candidate = cost[rest ^ (1 << j)] + w[i][j]
+            if candidate < cost[mask]:
+                cost[mask] = candidate
+                choice[mask] = j
+
+    pairs = []
+    mask = size - 1
+    while mask:
+        i = (mask & -mask).bit_length() - 1
+        j = choice[mask]
+        pairs.append((odd[i], odd[j]))
+        mask ^= (1 << i) | (1 << j)
+    return pairs
+
+
+def greedy_matching(odd, weights, passes=3):
+    """
+    Approximate perfect matching: cheapest edges first, then pairwise swaps between matched edges.
+    :param odd: List of vertices (even count)
+    :param weights: 2D numpy array of edge weights
+    :param passes: Number of improvement sweeps over all pairs of matched edges
+    :return: List of matched (u, v) pairs
+    """
+    odd = np.asarray(odd)
+    iu, ju = np.triu_indices(len(odd), k=1)
+    order = np.argsort(weights[odd[iu], odd[ju]], kind="stable")
+
+    matched = set()
+    pairs = []
+    for e in order:
+        u, v = int(odd[iu[e]]), int(odd[ju[e]])
+        if u in matched or v in matched:
+            continue
+        matched.update((u, v))
+        pairs.append((u, v))
+        if len(pairs) == len(odd) // 2:
+            break
+
+    for _ in range(passes):
+        improved = False
+        for x, y in combinations(range(len(pairs)), 2):
+            (a, b), (c, d) = pairs[x], pairs[y]
+            current = weights[a, b] + weights[c, d]
+            if weights[a, c] + weights[b, d] < current - 1e-9:
+                pairs[x], pairs[y] = (a, c), (b, d)
+                improved = True
+            elif weights[a, d] + weights[b, c] < current - 1e-9:
+                pairs[x], pairs[y] = (a, d), (b, c)
+                improved = True
+        if not improved:
+            break
+    return pairs
+
+
+def euler_tour(n, edges, start):
+    """
+    Eulerian circuit of a connected multigraph with even degrees (iterative Hierholzer).
+    :param n: Number of vertices
+    :param edges: List of (u, v) edges, duplicates allowed
+    :param start: Vertex to start from
+    :return: Circuit as a list of vertices, beginning and ending at start
+    """
+    incident = [[] for _ in range(n)]
+    for e, (u, v) in enumerate(edges):
+        incident[u].append(e)
+        incident[v].append(e)
+    used = bytearray(len(edges))
+    cursor = [0] * n
+
+    stack = [start]
+    circuit = []
+    while stack:
+        u = stack[-1]
+        while cursor[u] < len(incident[u]) and used[incident[u][cursor[u]]]:
+            cursor[u] += 1
+        if cursor[u] == len(incident[u]):
+            circuit.append(stack.pop())
+            continue
+        e = incident[u][cursor[u]]
+        used[e] = 1
+        a, b = edges[e]
+        stack.append(b if a == u else a)
+    circuit.reverse()
+    return circuit
+
+
+def christofides_tsp(distances, start=0, exact_threshold=EXACT_MATCHING_THRESHOLD):
+    """
+    Christofides' algorithm: MST + minimum-weight matching on odd-degree vertices,
+    Euler circuit and shortcutting. Asymmetric matrices are symmetrized for construction
+    and the returned total uses the original matrix.
+    :param distances: 2D array-like (n x n) distance matrix
+    :param start: Index of the starting point
+    :param exact_threshold: Largest odd-vertex count matched exactly, greedy matching above it
+    :return: Visited path, total distance and per-stage timings in milliseconds
+    """
+    distances = np.asarray(distances)
+    n = distances.shape[0]
+    weights = (distances.astype(np.float64) + distances.T) / 2
+    timings = {}
+
+    clock = time.perf_counter()
+    mst = kruskal_mst(weights)
+    edges = [(u, v) for u in mst for v in mst[u] if u < v]
+    timings["mst"] = (time.perf_counter() - clock) * 1000
+
+    clock = time.perf_counter()
+    odd = [u for u in range(n) if len(mst[u]) % 2]
+    if len(odd) <= exact_threshold:
+        matching = exact_matching(odd, weights)
+    else:
+        matching = greedy_matching(odd, weights)
+    timings["matching"] = (time.perf_counter() - clock) * 1000
+
+    clock = time.perf_counter()
+    circuit = euler_tour(n, edges + matching, start)
+    timings["euler"] = (time.perf_counter() - clock) * 1000
+
+    clock = time.perf_counter()
+    seen = bytearray(n)
+    path = []
+    for u in circuit:
+        if not seen[u]:
+            seen[u] = 1
+            path.append(u)
+    path.append(start)
+    timings["shortcut"] = (time.perf_counter() - clock) * 1000
+    timings["total"] = sum(timings.values())
+
+    total_distance = distances[path[:-1], path[1:]].sum().item()
+    return path, total_distance, timings
@@ -0,0 +1,144 @@
+import numpy as np
+
+from src.local_search import local_search, neighbor_lists, tour_length
+
+# Above this many customers only savings between k nearest neighbours are considered
+DENSE_SAVINGS_MAX_N = 500
+SAVINGS_NEIGHBORS = 25
+
+
+def candidate_savings(distances, depot, customers, k=SAVINGS_NEIGHBORS):
+    """
+    Clarke-Wright savings s(i, j) = d(i, depot) + d(depot, j) - d(i, j) of joining i -> j, best first.
+    All pairs are scored for small instances, only each customer's k nearest neighbours otherwise,
+    which keeps the candidate list O(n k) instead of O(n^2).
+    :return: (i, j) int64 arrays of positive-saving candidate edges, sorted by saving descending
+    """
+    customers = np.asarray(customers, dtype=np.int64)
+    if len(customers) <= DENSE_SAVINGS_MAX_N:
+        i = np.repeat(customers, len(customers))
+        j = np.tile(customers, len(customers))
+    else:
+        sub = distances[np.ix_(customers, customers)]
+        neighbors = neighbor_lists(sub, k)
+        i = np.repeat(customers, neighbors.shape[1])
+        j = customers[neighbors.ravel()]
+        # Both directions, since the matrix may be asymmetric
+        i, j = np.concatenate([i, j]), np.concatenate([j, i])
+    keep = i != j
+    i, j = i[keep], j[keep]
+    savings = distances[i, depot].astype(np.float64) + distances[depot, j] - distances[i, j]
+    positive = savings > 0
+    i, j, savings = i[positive], j[positive], savings[positive]
+    order = np.argsort(-savings, kind="stable")
+    return i[order], j[order]
+
+
+def route_cost(route, matrix, depot):
+    """
+    Cost of depot -> route -> depot on matrix.
+    """
+    if not route:
+        return 0
+    return tour_length([depot] + list(route) + [depot], matrix)
+
+
+def clarke_wright(distances, demands, capacity, depot=0, durations=None, max_duration=None):
+    """
+    Parallel Clarke-Wright savings construction for the capacitated VRP.
+    Every customer starts on its own route; routes are then joined end to start in order of
+    decreasing saving while the load stays within capacity and, when durations are given,
+    the route duration within max_duration. Routes are never reversed, so asymmetric
+    matrices are handled correctly.
+    :param distances: 2D numpy array (n x n)
+    :param demands: Demand of every node (the depot's is ignored)
+    :param capacity: Vehicle capacity
+    :param depot: Depot index
+    :param durations: Optional 2D numpy array (n x n) of travel times
+    :param max_duration: Longest allowed route duration, requires durations
+    :return: List of routes, each a list of customers in visiting order (depot excluded)
+    """
+    n = distances.shape[0]
+    demands = np.asarray(demands, dtype=np.float64)
+    customers = [node for node in range(n) if node != depot]
+    too_big = [node for node in customers if demands[node] > capacity]
+    if too_big:
+        raise ValueError(f"Demand of nodes {too_big} exceeds the vehicle capacity {capacity}")
+    if max_duration is not None:
+        if durations is None:
+            raise ValueError("max_duration requires a durations matrix")
+        too_far = [node for node in customers if route_cost([node], durations, depot) > max_duration]
+        if too_far:
+            raise ValueError(f"Nodes {too_far} cannot be served within the max duration {max_duration}")
+
+    routes = {node: [node] for node in customers}
+    route_of = list(range(n))
+    load = {node: demands[node] for node in customers}
+    duration = {}
+    if max_duration is not None:
+        duration = {node: route_cost([node], durations, depot) for node in customers}
+
+    for i, j in zip(*(a.tolist() for a in candidate_savings(distances, depot, customers))):
+        a, b = route_of[i], route_of[j]
+        if a == b or routes[a][-1] != i or routes[b][0] != j:
+            continue
+        if load[a] + load[b] > capacity:
+            continue
+        if max_duration is not None:
+            merged = duration[a] + duration[b] - durations[i, depot] - durations[depot, j] + durations[i, j]
+            if merged > max_duration:
+                continue
+            duration[a] = merged
+        # Keep a's id; relabel the nodes of b
+        routes[a].extend(routes[b])
+        for node in routes[b]:
+            route_of[node] = a
+        load[a] += load.pop(b)
+        duration.pop(b, None)
+        del routes[b]
+
+    return list(routes.values())
+
+
+def improve_route(sub, moves=("2opt", "oropt"), time_budget_ms=None):
+    """
+    Improves one vehicle's route with local search on its own sub-matrix, depot at index 0.
+    Module level and matrix-only so it is cheap to send to a process pool.
+    :param sub: (m x m) distances of [depot, *route]
+    :return: Visiting order as indices into sub (depot excluded)
+    """
+    m = sub.shape[0]
+    if m < 4:
+        return list(range(1, m))
+    tour, _ = local_search(list(range(m)) + [0], sub, moves=moves, time_budget_ms=time_budget_ms)
+    return tour[1:-1]
+
+
+def solve_cvrp(distances, demands, capacity, depot=0, durations=None, max_duration=None,
+               moves=("2opt", "oropt"), time_budget_ms=None, executor=None):
+    """
+    Clarke-Wright construction followed by per-route improvement.
+    Improved routes that would break max_duration are kept as constructed.
+    :param moves: Local search moves, empty to skip the improvement
+    :param time_budget_ms: Budget per route
+    :param executor: Optional concurrent.futures executor to improve routes in parallel
+    :return: List of routes (depot excluded)
+    """
+    routes = clarke_wright(distances, demands, capacity, depot, durations, max_duration)
+    if not moves:
+        return routes
+
+    nodes = [np.array([depot] + route) for route in routes]
+    args = [(np.ascontiguousarray(distances[np.ix_(ids, ids)]), tuple(moves), time_budget_ms) for ids in nodes]
+    if executor is None:
+        orders = [improve_route(*a) for a in args]
+    else:
+        orders = [future.result() for future in [executor.submit(improve_route, *a) for a in args]]
+
+    result = []
+    for route, ids, order in zip(routes, nodes, orders):
+        better = ids[order].tolist()
+        if max_duration is not None and route_cost(better, durations, depot) > max_duration:
+            better = route
+        result.append(better)
+    return result
@@ -0,0 +1,113 @@
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def to_array(points):
+    """
+    Converts points to an (n, 2) float64 coordinate array.
+    :param points: List of (label, x, y) tuples or an (n, 2) array-like
+    :return: (n, 2) numpy array
+    """
+    if isinstance(points, np.ndarray):
+        return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    points = list(points)
+    if points and len(points[0]) == 3:
+        return np.array([(p[1], p[2]) for p in points], dtype=np.float64).reshape(-1, 2)
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+def euclidean_block(a, b, dtype=np.float64):
+    """
+    Euclidean distances between every row of a and every row of b.
+    :param a: (m, 2) coordinates
+    :param b: (k, 2) coordinates
+    :return: (m, k) array of dtype
+    """
+    dx = a[:, 0, None] - b[None, :, 0]
+    dy = a[:, 1, None] - b[None, :, 1]
+    return np.hypot(dx, dy, out=dx).astype(dtype, copy=False)
+
+
+def haversine_block(a, b, dtype=np.float64):
+    """
+    Great-circle distances in metres between every row of a and every row of b.
+    :param a: (m, 2) (lat, lng) in degrees
+    :param b: (k, 2) (lat, lng) in degrees
+    :return: (m, k) array of dtype
+    """
+    lat1 = np.radians(a[:, 0])[:, None]
+    lat2 = np.radians(b[:, 0])[None, :]
+    dlat = lat2 - lat1
+    dlng = np.radians(b[:, 1])[None, :] - np.radians(a[:, 1])[:, None]
+    h = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return (2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))).astype(dtype, copy=False)
+
+
+def paired_distances(a, b, metric="euclidean"):
+    """
+    Distance between a[i] and b[i] for every row i, without the (m, k) cross product.
+    :return: (m,) float64 array
+    """
+    if metric == "euclidean":
+        return np.hypot(a[:, 0] - b[:, 0], a[:, 1] - b[:, 1])
+    if metric == "haversine":
+        lat1, lat2 = np.radians(a[:, 0]), np.radians(b[:, 0])
+        dlng = np.radians(b[:, 1] - a[:, 1])
+        h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+        return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+    raise ValueError(f"Unknown metric '{metric}', expected one of {sorted(METRICS)}")
+
+
+METRICS = {
+    "euclidean": euclidean_block,
+    "haversine": haversine_block,
+}
+
+
+def distance_matrix(points, metric="euclidean", dtype=np.float64, block_size=None, out=None):
+    """
+    Builds the full distance matrix with NumPy broadcasting.
+    With block_size set, rows are computed block_size at a time so the temporaries stay small,
+    and with out set to a path the matrix is written to a np.memmap instead of RAM.
+    :param points: List of (label, x, y) tuples or (n, 2) coordinates ((lat, lng) for haversine)
+    :param metric: "euclidean" or "haversine"
+    :param dtype: Output dtype, e.g. np.float32 to halve memory
+    :param block_size: Number of rows per block, or None to compute in one pass
+    :param out: Optional file path for a np.memmap output, or a preallocated (n, n) array
+    :return: (n, n) numpy array or np.memmap
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {sorted(METRICS)}")
+    block = METRICS[metric]
+    coords = to_array(points)
+    n = coords.shape[0]
+
+    if out is None and block_size is None:
+        distances = block(coords, coords, dtype)
+        np.fill_diagonal(distances, 0)
+        return distances
+
+    if isinstance(out, str):
+        distances = np.memmap(out, dtype=dtype, mode="w+", shape=(n, n))
+    elif out is not None:
+        distances = out
+    else:
+        distances = np.empty((n, n), dtype=dtype)
+
+    step = block_size or min(n, 1024)
+    for start in range(0, n, step):
+        stop = min(start + step, n)
+        distances[start:stop] = block(coords[start:stop], coords, dtype)
+        distances[np.arange(start, stop), np.arange(start, stop)] = 0
+
+    if isinstance(distances, np.memmap):
+        distances.flush()
+    return distances
+
+
+def open_distance_matrix(path, n, dtype=np.float32):
+    """
+    Opens a matrix previously written by distance_matrix(..., out=path) read-only.
+    """
+    return np.memmap(path, dtype=dtype, mode="r", shape=(n, n))
@@ -1,7 +1,7 @@
 import numpy as np
-import math
 
-from src.plot import plot_tsp_with_arrows
+from src.distances import distance_matrix
+from src.nearest_neighbor import nearest_neighbor_tour
 
 
 def read_coordinates(file_path):
@@ -18,21 +18,16 @@ def read_coordinates(file_path):
     return points
 
 
-def calculate_distance_matrix(points):
+def calculate_distance_matrix(points, dtype=np.float64, block_size=None, out=None):
     """
     Calculates the distance matrix between points based on their coordinates.
     :param points: List of (label, x, y)
+    :param dtype: Output dtype, np.float32 halves the memory
+    :param block_size: Rows per block for inputs that don't fit in RAM at once
+    :param out: Optional file path to write the matrix to as a np.memmap
     :return: 2D numpy array representing the distance matrix
     """
-    n = len(points)
-    distances = np.zeros((n, n))
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                x1, y1 = points[i][1], points[i][2]
-                x2, y2 = points[j][1], points[j][2]
-                distances[i][j] = math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
-    return distances
+    return distance_matrix(points, "euclidean", dtype=dtype, block_size=block_size, out=out)
 
 
 def greedy_tsp(distances, start):
@@ -42,32 +37,11 @@ def greedy_tsp(distances, start):
     :param start: Index of the starting point
     :return: Visited path and total distance
     """
-    n = distances.shape[0]
-    visited = [False] * n
-    path = [start]
-    total_distance = 0
-
-    visited[start] = True
-    current = start
-    for _ in range(n - 1):
-        nearest = None
-        min_distance = float('inf')
-        for i in range(n):
-            if not visited[i] and distances[current][i] < min_distance:
-                nearest = i
-                min_distance = distances[current][i]
-
-        path.append(nearest)
-        total_distance += min_distance
-        visited[nearest] = True
-        current = nearest
-
-    total_distance += distances[current][start]
-    path.append(start)
-
-    return path, total_distance
+    return nearest_neighbor_tour(distances, start)
 
 def main():
+    from src.plot import plot_tsp_with_arrows
+
     # Read coordinates from the file
     coordinates_file = "../data/test_data.txt"  # Update this path as needed
     points = read_coordinates(coordinates_file)
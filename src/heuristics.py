@@ -0,0 +1,11 @@
+from src.kruskal import kruskal_mst, krustral_tsp
+from src.nearest_neighbor import nearest_neighbor_tour
+from src.prim import prim_mst
+from src.tour import preorder_tour
+
+# Construction heuristics on a dense distance matrix: name -> solve(distances) -> closed tour from node 0
+TOUR_HEURISTICS = {
+    "greedy": lambda d: nearest_neighbor_tour(d, 0)[0],
+    "kruskal": lambda d: krustral_tsp(kruskal_mst(d), 0),
+    "prim": lambda d: preorder_tour(prim_mst(d), 0),
+}
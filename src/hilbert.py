@@ -0,0 +1,62 @@
+import numpy as np
+
+from src.distances import paired_distances, to_array
+
+# Bits per axis of the Hilbert grid, 2^16 x 2^16 cells
+HILBERT_ORDER = 16
+
+
+def hilbert_index(coords, order=HILBERT_ORDER):
+    """
+    Position of every point along a Hilbert curve over the bounding box of the points.
+    Vectorized over the points, one pass per bit of the grid.
+    :param coords: (n, 2) coordinates
+    :param order: Bits per axis, at most 31
+    :return: (n,) int64 curve positions
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    side = 1 << order
+    low = coords.min(axis=0)
+    span = max(float((coords.max(axis=0) - low).max()), 1e-12)
+    grid = np.minimum(((coords - low) / span * side).astype(np.int64), side - 1)
+    x, y = grid[:, 0].copy(), grid[:, 1].copy()
+
+    d = np.zeros(len(coords), dtype=np.int64)
+    s = side >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the curve continues in the right orientation
+        flip = ~ry & rx
+        x[flip] = side - 1 - x[flip]
+        y[flip] = side - 1 - y[flip]
+        swap = ~ry
+        x[swap], y[swap] = y[swap], x[swap]
+        s >>= 1
+    return d
+
+
+def hilbert_tour(points, start=0, metric="euclidean", order=HILBERT_ORDER):
+    """
+    Visits the points in Hilbert curve order: O(n log n) time, O(n) memory, no distance matrix.
+    :param points: List of (label, x, y) tuples, or (n, 2) coordinates ((lat, lng) for haversine)
+    :param start: Index of the starting point
+    :param metric: "euclidean" or "haversine", used for the curve projection and the length
+    :param order: Bits per axis of the Hilbert grid
+    :return: Visited path (returning to start) and total distance
+    """
+    coords = to_array(points)
+    n = len(coords)
+    if n == 0:
+        return [], 0.0
+    plane = coords
+    if metric == "haversine":
+        # (lat, lng) -> roughly equal-area (x, y) so the curve follows ground distance
+        plane = np.column_stack([coords[:, 1] * np.cos(np.radians(coords[:, 0].mean())), coords[:, 0]])
+
+    path = np.argsort(hilbert_index(plane, order), kind="stable")
+    at = int(np.flatnonzero(path == start)[0])
+    path = np.concatenate([path[at:], path[:at], [start]])
+    total = float(paired_distances(coords[path[:-1]], coords[path[1:]], metric).sum())
+    return path.tolist(), total
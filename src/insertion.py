@@ -0,0 +1,25 @@
+import numpy as np
+
+
+def insertion_costs(tour, distances, node):
+    """
+    Extra length of placing node on each edge of a closed tour.
+    :param tour: Closed tour [start, ..., start]
+    :param distances: 2D numpy array (n x n), may be asymmetric
+    :param node: Node not yet in the tour
+    :return: Array with the cost of inserting node after tour[i], for every edge i
+    """
+    t = np.asarray(tour)
+    return (distances[t[:-1], node].astype(np.float64) + distances[node, t[1:]]
+            - distances[t[:-1], t[1:]])
+
+
+def cheapest_insertion(tour, distances, node):
+    """
+    Inserts node where it lengthens the closed tour the least, in O(n).
+    :return: New closed tour and the length it added
+    """
+    costs = insertion_costs(tour, distances, node)
+    i = int(costs.argmin())
+    return list(tour[:i + 1]) + [node] + list(tour[i + 1:]), costs[i].item()
+
@@ -0,0 +1,121 @@
+"""
+Compact binary instance files for offline benchmarks.
+
+Layout (little endian):
+    64 byte header   magic, version, flags, n, label bytes, metric, name
+    coordinates      (n, 2) float64
+    distances        (n, n) float32, only when FLAG_MATRIX is set
+    labels           UTF-8, newline separated, only when FLAG_LABELS is set
+
+Arrays are opened with np.memmap, so loading is near-instant and solver processes
+reading the same file share its pages.
+
+    python -m src.instance_format data/test_data.txt data/test_data.inst --matrix
+    python -m src.instance_format data/tsplib/berlin52.tsp data/tsplib/berlin52.inst --matrix
+"""
+import argparse
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from src.distances import distance_matrix
+from src.greedy import read_coordinates
+from src.tsplib import EDGE_WEIGHT_TYPES, read_tsplib, tsplib_distance_matrix
+
+MAGIC = b"SRINST\x00\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ16s16s")
+FLAG_MATRIX = 1
+FLAG_LABELS = 2
+
+Instance = namedtuple("Instance", ["name", "metric", "coords", "distances", "labels"])
+
+
+def write_instance(path, coords, labels=None, name="", metric="euclidean", with_matrix=False):
+    """
+    Writes an instance file, computing the float32 distance matrix straight into it when asked.
+    :param path: Output file path
+    :param coords: (n, 2) coordinates
+    :param labels: Optional list of n point labels
+    :param name: Instance name, at most 16 bytes are kept
+    :param metric: "euclidean", "haversine" or a TSPLIB edge weight type
+    :param with_matrix: Also store the precomputed distance matrix
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2)
+    n = coords.shape[0]
+    label_bytes = "\n".join(labels).encode("utf-8") if labels is not None else b""
+    flags = (FLAG_MATRIX if with_matrix else 0) | (FLAG_LABELS if labels is not None else 0)
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, flags, n, len(label_bytes),
+                               metric.encode("utf-8")[:16], name.encode("utf-8")[:16]))
+        file.write(coords.tobytes())
+        if with_matrix:
+            file.truncate(HEADER.size + coords.nbytes + 4 * n * n)
+            file.seek(0, 2)
+        file.write(label_bytes)
+
+    if with_matrix:
+        out = np.memmap(path, dtype=np.float32, mode="r+", offset=HEADER.size + coords.nbytes, shape=(n, n))
+        if metric in EDGE_WEIGHT_TYPES:
+            tsplib_distance_matrix(coords, metric, out=out)
+        else:
+            distance_matrix(coords, metric, dtype=np.float32, out=out)
+        out.flush()
+        del out
+
+
+def load_instance(path):
+    """
+    Opens an instance file read-only without copying the arrays.
+    :return: Instance(name, metric, coords, distances, labels); distances is None when not stored
+    """
+    with open(path, "rb") as file:
+        magic, version, flags, n, label_size, metric, name = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an instance file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported instance version {version} in {path}")
+        offset = HEADER.size + 16 * n + (4 * n * n if flags & FLAG_MATRIX else 0)
+        labels = None
+        if flags & FLAG_LABELS:
+            file.seek(offset)
+            labels = file.read(label_size).decode("utf-8").split("\n")
+
+    coords = np.memmap(path, dtype=np.float64, mode="r", offset=HEADER.size, shape=(n, 2))
+    distances = None
+    if flags & FLAG_MATRIX:
+        distances = np.memmap(path, dtype=np.float32, mode="r", offset=HEADER.size + 16 * n, shape=(n, n))
+    return Instance(name.rstrip(b"\x00").decode("utf-8"), metric.rstrip(b"\x00").decode("utf-8"),
+                    coords, distances, labels)
+
+
+def convert(source, dest, with_matrix=False):
+    """
+    Converts a label,x,y CSV (like data/test_data.txt) or a TSPLIB .tsp file to an instance file.
+    """
+    if source.endswith(".tsp"):
+        name, edge_weight_type, coords = read_tsplib(source)
+        write_instance(dest, coords, name=name, metric=edge_weight_type, with_matrix=with_matrix)
+    else:
+        points = read_coordinates(source)
+        write_instance(dest, [(x, y) for _, x, y in points], labels=[label for label, _, _ in points],
+                       with_matrix=with_matrix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a CSV or TSPLIB instance to the binary format")
+    parser.add_argument("source", help="label,x,y CSV or TSPLIB .tsp file")
+    parser.add_argument("dest", help="Output instance file")
+    parser.add_argument("--matrix", action="store_true", help="Store the float32 distance matrix too")
+    args = parser.parse_args()
+
+    convert(args.source, args.dest, with_matrix=args.matrix)
+    instance = load_instance(args.dest)
+    stored = "with" if instance.distances is not None else "without"
+    print(f"Wrote {args.dest}: {len(instance.coords)} points ({instance.metric}) {stored} distance matrix")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,82 @@
 import numpy as np
 import math
+from array import array
 from collections import defaultdict
-import matplotlib.pyplot as plt
+
+from src.distances import distance_matrix, to_array
+from src.spatial import knn_graph, nearest_foreign_pairs
+from src.tour import preorder_tour
 
 class UnionFind:
+    """
+    Disjoint sets over 0..n-1 in two flat C int arrays.
+    find halves paths iteratively (no recursion limit), union links the smaller set
+    under the larger one, and `components` tells Kruskal when it can stop.
+    """
+    __slots__ = ("parent", "size", "components")
+
     def __init__(self, n):
-        self.parent = list(range(n))
-        self.rank = [0] * n
+        self.parent = array("i", range(n))
+        self.size = array("i", [1]) * n
+        self.components = n
 
     def find(self, u):
-        if self.parent[u] != u:
-            self.parent[u] = self.find(self.parent[u])
-        return self.parent[u]
+        parent = self.parent
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
 
     def union(self, u, v):
         root_u = self.find(u)
         root_v = self.find(v)
-        if root_u != root_v:
-            if self.rank[root_u] > self.rank[root_v]:
-                self.parent[root_v] = root_u
-            elif self.rank[root_u] < self.rank[root_v]:
-                self.parent[root_u] = root_v
-            else:
-                self.parent[root_v] = root_u
-                self.rank[root_u] += 1
-            return True
-        return False
+        if root_u == root_v:
+            return False
+        size = self.size
+        if size[root_u] < size[root_v]:
+            root_u, root_v = root_v, root_u
+        self.parent[root_v] = root_u
+        size[root_u] += size[root_v]
+        self.components -= 1
+        return True
+
+    def roots(self, nodes):
+        """
+        Vectorized find for a NumPy array of nodes, by pointer jumping on a view of the parent array.
+        """
+        parent = np.frombuffer(self.parent, dtype=np.intc)
+        roots = np.asarray(nodes)
+        while True:
+            up = parent[roots]
+            if np.array_equal(up, roots):
+                return roots
+            roots = up
+
+    def union_edges(self, u, v, chunk=None):
+        """
+        Unions edges in order, exactly like calling union on each one, and stops once all
+        nodes are connected. Every chunk is filtered with the vectorized find first, so edges
+        inside an existing set never reach the Python loop.
+        :param u: NumPy array of edge endpoints, in the order to try them (e.g. sorted by weight)
+        :param v: NumPy array of the other endpoints
+        :param chunk: Edges filtered at a time, defaults to the number of nodes
+        :return: Boolean mask of the accepted edges
+        """
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        accepted = np.zeros(len(u), dtype=bool)
+        step = chunk or max(len(self.parent), 1)
+        for start in range(0, len(u), step):
+            if self.components <= 1:
+                break
+            cu, cv = u[start:start + step], v[start:start + step]
+            candidates = np.flatnonzero(self.roots(cu) != self.roots(cv))
+            for i, a, b in zip(candidates.tolist(), cu[candidates].tolist(), cv[candidates].tolist()):
+                if self.union(a, b):
+                    accepted[start + i] = True
+                    if self.components == 1:
+                        break
+        return accepted
 
 # Compute Euclidean Distance between two points
 def euclidean_distance(p1, p2):
@@ -33,58 +84,73 @@ def euclidean_distance(p1, p2):
 
 # Kruskal Algorithm using the UnionFind class
 def kruskal_mst(distances):
+    """
+    Kruskal's MST on a dense distance matrix: the upper-triangle edges are sorted once with
+    NumPy (stable, so ties keep the row-major order) and unioned in bulk.
+    :param distances: 2D array-like (n x n) distance matrix
+    :return: MST adjacency (node -> list of neighbours)
+    """
+    distances = np.asarray(distances)
     n = len(distances)
-    edges = []
+    u, v = np.triu_indices(n, k=1)
+    order = np.argsort(distances[u, v], kind="stable")
+    u, v = u[order], v[order]
 
-    for i in range(n):
-        for j in range(i + 1, n):
-            edges.append((distances[i][j], i, j))
+    accepted = UnionFind(n).union_edges(u, v)
+    mst = defaultdict(list)
+    for a, b in zip(u[accepted].tolist(), v[accepted].tolist()):
+        mst[a].append(b)
+        mst[b].append(a)
 
-    edges.sort(key=lambda x: x[0])
+    return mst
 
-    uf = UnionFind(n)
-    mst = defaultdict(list)
+# Kruskal on a k-nearest-neighbour candidate graph for coordinate inputs
+# Largest input the dense fallback may build an n x n matrix for
+DENSE_FALLBACK_MAX_N = 5000
+
+
+def kruskal_mst_knn(points, k=8):
+    """
+    Approximate MST of a set of points from a sparse k-nearest-neighbour candidate graph.
+    The tree can be slightly heavier than the true MST when an MST edge is not among the
+    candidates. A disconnected candidate graph (e.g. two towns) is joined Boruvka style,
+    adding the nearest edge out of every component until one is left, without a distance matrix.
+    :param points: List of (label, x, y) or (n, 2) coordinates
+    :param k: Number of neighbours per point in the candidate graph
+    :return: Spanning tree adjacency (node -> list of neighbours)
+    """
+    coords = to_array(points)
+    n = coords.shape[0]
+    u, v, weight = knn_graph(coords, k)
+    order = np.argsort(weight, kind="stable")
+    u, v = u[order], v[order]
 
-    for weight, u, v in edges:
-        if uf.union(u, v):  
-            mst[u].append(v)
-            mst[v].append(u)
+    uf = UnionFind(n)
+    accepted = uf.union_edges(u, v)
+    edges = [(u[accepted], v[accepted])]
+    while uf.components > 1:
+        components = uf.components
+        bridge_u, bridge_v, bridge_weight = nearest_foreign_pairs(coords, uf.roots(np.arange(n)))
+        order = np.argsort(bridge_weight, kind="stable")
+        bridge_u, bridge_v = bridge_u[order], bridge_v[order]
+        accepted = uf.union_edges(bridge_u, bridge_v)
+        edges.append((bridge_u[accepted], bridge_v[accepted]))
+        if uf.components == components:
+            if n > DENSE_FALLBACK_MAX_N:
+                raise ValueError(f"Could not connect the candidate graph of {n} points")
+            return kruskal_mst(distance_matrix(coords))
 
+    mst = defaultdict(list)
+    for edge_u, edge_v in edges:
+        for a, b in zip(edge_u.tolist(), edge_v.tolist()):
+            mst[a].append(b)
+            mst[b].append(a)
     return mst
 
-# DFS traversal of the MST to generate a path
-def dfs(mst, start, visited, path):
-    visited.add(start)
-    path.append(start)
-    for neighbor in mst[start]:
-        if neighbor not in visited:
-            dfs(mst, neighbor, visited, path)
-
-# Shortcutting to remove repeated cities and form a valid TSP cycle
-def shortcut(path):
-    visited = set()
-    new_path = []
-    for city in path:
-        if city not in visited:
-            new_path.append(city)
-            visited.add(city)
-    return new_path
-
-# TSP approximation using Kruskal's MST and DFS
+# TSP approximation using Kruskal's MST and an iterative preorder walk
 def krustral_tsp(mst, start):
-    visited = set()
-    path = []
-    
-    # Perform DFS on MST
-    dfs(mst, start, visited, path)
-    
-    # Apply shortcutting to avoid repeated cities
-    tsp_path = shortcut(path)
-    
-    # Make the path circular (return to the start)
-    tsp_path.append(tsp_path[0])
-    
-    return tsp_path
+    # The walk skips repeated cities and returns to the start
+    return preorder_tour(mst, start)
 
 def read_points_from_file(filename):
     points = []
@@ -99,6 +165,8 @@ def euclidean_distance(point1, point2):
     return np.sqrt((point1[1] - point2[1])**2 + (point1[2] - point2[2])**2)
 
 def plot_tsp_with_arrows(locations, tsp_path):
+    import matplotlib.pyplot as plt
+
     labels, x_coords, y_coords = zip(*locations)
     
     fig, ax = plt.subplots(figsize=(10, 8))
@@ -133,13 +201,7 @@ def plot_tsp_with_arrows(locations, tsp_path):
 def main():
     locations = read_points_from_file('data/test_data.txt')
 
-    n = len(locations)
-    distances = [[0] * n for _ in range(n)]
-    for i in range(n):
-        for j in range(i + 1, n):
-            dist = euclidean_distance(locations[i], locations[j])
-            distances[i][j] = dist
-            distances[j][i] = dist  
+    distances = distance_matrix(locations)
 
     mst = kruskal_mst(distances)
 
@@ -0,0 +1,212 @@
+import time
+from collections import deque
+
+import numpy as np
+
+EPSILON = 1e-9
+MOVES = ("2opt", "oropt")
+
+
+def neighbor_lists(distances, k=8):
+    """
+    k nearest neighbours of every node, closest first.
+    :param distances: 2D numpy array (n x n)
+    :param k: Number of neighbours per node
+    :return: (n, k) int64 array
+    """
+    n = distances.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64)
+    masked = np.array(distances, dtype=np.float64)
+    np.fill_diagonal(masked, np.inf)
+    nearest = np.argpartition(masked, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(masked, nearest, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+def tour_length(tour, distances):
+    """
+    Length of a closed tour [start, ..., start].
+    """
+    tour = np.asarray(tour)
+    return distances[tour[:-1], tour[1:]].sum().item()
+
+
+class _Tour:
+    """
+    Array view of an open tour with node positions and prefix sums of the edge costs
+    in both directions, so segment reversals are priced in O(1) even for asymmetric matrices.
+    """
+
+    def __init__(self, order, distances):
+        self.distances = distances
+        self.set(order)
+
+    def set(self, order):
+        self.order = list(order)
+        nodes = np.asarray(self.order + self.order[:1])
+        self.pos = np.empty(len(self.order), dtype=np.int64)
+        self.pos[nodes[:-1]] = np.arange(len(self.order))
+        self.pos = self.pos.tolist()
+        self.fwd = np.concatenate([[0.0], np.cumsum(self.distances[nodes[:-1], nodes[1:]])]).tolist()
+        self.bwd = np.concatenate([[0.0], np.cumsum(self.distances[nodes[1:], nodes[:-1]])]).tolist()
+
+    def succ(self, i):
+        return self.order[(i + 1) % len(self.order)]
+
+    def reversal_delta(self, d, p, q):
+        """
+        Change in length from reversing positions p+1..q (edges at p and q are replaced).
+        """
+        t = self.order
+        a, b, c, e = t[p], t[p + 1], t[q], self.succ(q)
+        removed = d[a, b] + d[c, e] + self.fwd[q] - self.fwd[p + 1]
+        added = d[a, c] + d[b, e] + self.bwd[q] - self.bwd[p + 1]
+        return added - removed
+
+
+def _try_2opt(tour, d, a, neighbors):
+    """
+    Looks for an improving 2-opt move that makes a and one of its neighbours adjacent.
+    :return: (delta, p, q) of the first improving move, or None
+    """
+    n = len(tour.order)
+    i = tour.pos[a]
+    to_succ = d[a, tour.succ(i)]
+    to_pred = d[tour.order[i - 1], a]
+    for c in neighbors:
+        d_ac = d[a, c]
+        if d_ac >= to_succ and d_ac >= to_pred:
+            break
+        j = tour.pos[c]
+        low, high = min(i, j), max(i, j)
+        # Join a and c through their successor edges, then through their predecessor edges
+        for p, q in ((low, high), (low - 1, high - 1)):
+            if p < 0 or q - p < 2 or q >= n:
+                continue
+            delta = tour.reversal_delta(d, p, q)
+            if delta < -EPSILON:
+                return delta, p, q
+    return None
+
+
+def _try_oropt(tour, d, a, neighbors):
+    """
+    Looks for an improving move of the segment of 1-3 nodes starting at a to sit next to a neighbour.
+    :return: (delta, i, length, c, after) of the first improving move, or None
+    """
+    n = len(tour.order)
+    t = tour.order
+    i = tour.pos[a]
+    if i == 0:
+        return None
+    for length in (1, 2, 3):
+        if i + length - 1 > n - 1 or length >= n - 1:
+            break
+        s1, s2 = a, t[i + length - 1]
+        prev, nxt = t[i - 1], tour.succ(i + length - 1)
+        gain = d[prev, s1] + d[s2, nxt] - d[prev, nxt]
+        if gain <= EPSILON:
+            continue
+        for c in neighbors:
+            j = tour.pos[c]
+            if i <= j < i + length:
+                continue
+            # Insert after c: c -> s1 ... s2 -> succ(c)
+            if c != prev:
+                e = tour.succ(j)
+                delta = d[c, s1] + d[s2, e] - d[c, e] - gain
+                if delta < -EPSILON:
+                    return delta, i, length, c, True
+            # Insert before c: pred(c) -> s1 ... s2 -> c
+            if c != nxt:
+                pc = t[j - 1]
+                delta = d[pc, s1] + d[s2, c] - d[pc, c] - gain
+                if delta < -EPSILON:
+                    return delta, i, length, c, False
+    return None
+
+
+def local_search(tour, distances, moves=MOVES, k=8, time_budget_ms=None, active=None, progress=None):
+    """
+    Improves a closed tour with 2-opt and Or-opt moves restricted to k-nearest neighbour lists.
+    Nodes whose surroundings did not change are skipped (don't-look bits), and the search
+    stops at a local optimum or when the time budget runs out. The start node stays first.
+    :param tour: Closed tour [start, ..., start]
+    :param distances: 2D numpy array (n x n), may be asymmetric
+    :param moves: Subset of ("2opt", "oropt")
+    :param k: Neighbour list size
+    :param time_budget_ms: Wall-clock budget in milliseconds, or None for no limit
+    :param active: Nodes to examine first, all nodes when None
+    :param progress: Optional callback(tour, length, iterations) called after every improving move
+    :return: Improved closed tour and a stats dict
+    """
+    unknown = set(moves) - set(MOVES)
+    if unknown:
+        raise ValueError(f"Unknown moves {sorted(unknown)}, expected a subset of {MOVES}")
+
+    started = time.perf_counter()
+    deadline = None if time_budget_ms is None else started + time_budget_ms / 1000
+    distances = np.asarray(distances)
+    before = tour_length(tour, distances)
+    stats = {"distance_before": before, "distance_after": before, "iterations": 0,
+             "elapsed_ms": 0.0, "timed_out": False}
+
+    order = [int(node) for node in tour[:-1]]
+    if len(order) < 4:
+        return list(tour), stats
+
+    d = memoryview(np.ascontiguousarray(distances, dtype=np.float64))
+    neighbors = neighbor_lists(distances, k).tolist()
+    state = _Tour(order, distances)
+
+    queue = deque(order if active is None else active)
+    queued = bytearray(len(order))
+    for node in queue:
+        queued[node] = 1
+
+    def wake(*nodes):
+        for node in nodes:
+            if not queued[node]:
+                queued[node] = 1
+                queue.append(node)
+
+    length = before
+    while queue:
+        if deadline is not None and time.perf_counter() > deadline:
+            stats["timed_out"] = True
+            break
+        a = queue.popleft()
+        queued[a] = 0
+
+        move = _try_2opt(state, d, a, neighbors[a]) if "2opt" in moves else None
+        if move is not None:
+            delta, p, q = move
+            t = state.order
+            touched = (t[p], t[p + 1], t[q], state.succ(q))
+            state.set(t[:p + 1] + t[p + 1:q + 1][::-1] + t[q + 1:])
+        else:
+            move = _try_oropt(state, d, a, neighbors[a]) if "oropt" in moves else None
+            if move is None:
+                continue
+            delta, i, seg_length, c, after = move
+            t = state.order
+            touched = (t[i - 1], a, t[i + seg_length - 1], state.succ(i + seg_length - 1), c)
+            segment = t[i:i + seg_length]
+            rest = t[:i] + t[i + seg_length:]
+            j = rest.index(c)
+            at = j + 1 if after else (j if j > 0 else len(rest))
+            state.set(rest[:at] + segment + rest[at:])
+            touched += (state.order[state.pos[c] - 1], state.succ(state.pos[c]))
+
+        length += delta
+        stats["iterations"] += 1
+        wake(a, *touched)
+        if progress is not None:
+            progress(state.order + state.order[:1], length, stats["iterations"])
+
+    improved = state.order + state.order[:1]
+    stats["distance_after"] = tour_length(improved, distances)
+    stats["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    return improved, stats
@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def blocked_value(dtype):
+    """
+    Largest value representable in dtype, used to mask out visited points.
+    """
+    if np.issubdtype(dtype, np.floating):
+        return np.inf
+    return np.iinfo(dtype).max
+
+
+def nearest_neighbor_tour(distances, start=0):
+    """
+    Greedy nearest-neighbour tour over a dense distance matrix.
+    Each step is a single masked argmin over the current row, reusing preallocated buffers.
+    :param distances: 2D array (n x n) distance matrix, ideally contiguous float32 or int32
+    :param start: Index of the starting point
+    :return: Visited path (returning to start) and total distance
+    """
+    distances = np.ascontiguousarray(distances)
+    n = distances.shape[0]
+
+    # Visited points are raised to the largest value so argmin never picks them
+    mask = np.zeros(n, dtype=distances.dtype)
+    visited = np.zeros(n, dtype=bool)
+    row = np.empty(n, dtype=distances.dtype)
+    blocked = blocked_value(distances.dtype)
+
+    path = np.empty(n + 1, dtype=np.int64)
+    path[0] = start
+    mask[start] = blocked
+    visited[start] = True
+    current = start
+    for step in range(1, n):
+        np.maximum(distances[current], mask, out=row)
+        current = int(row.argmin())
+        if visited[current]:
+            # Every unvisited point is as far as the mask (e.g. unreachable at inf), take the first one
+            current = int(np.flatnonzero(~visited)[0])
+        path[step] = current
+        mask[current] = blocked
+        visited[current] = True
+    path[n] = start
+
+    accumulator = np.float64 if np.issubdtype(distances.dtype, np.floating) else np.int64
+    total_distance = distances[path[:-1], path[1:]].sum(dtype=accumulator).item()
+    return path.tolist(), total_distance
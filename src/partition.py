@@ -0,0 +1,248 @@
+"""
+Divide and conquer tours for stop sets too large for one distance matrix.
+
+Points are split into clusters of at most max_cluster_size, every cluster is solved on its
+own small matrix in a process pool, the clusters are visited in the order of a tour over their
+centroids, each cluster cycle is cut where it connects best to its neighbours, and the seams
+are repaired with Or-opt on small windows. No step builds more than a cluster- or
+window-sized matrix, so memory stays bounded by the cluster size.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.distances import METRICS, distance_matrix, paired_distances, to_array
+from src.heuristics import TOUR_HEURISTICS
+from src.local_search import local_search
+from src.nearest_neighbor import nearest_neighbor_tour
+
+DEFAULT_MAX_CLUSTER_SIZE = 1000
+SEAM_WINDOW = 30
+
+
+def nearest_centroid(coords, centroids, chunk=8192):
+    """
+    Index of the closest centroid for every point, computed in chunks of rows.
+    """
+    labels = np.empty(len(coords), dtype=np.int64)
+    for start in range(0, len(coords), chunk):
+        labels[start:start + chunk] = METRICS["euclidean"](coords[start:start + chunk], centroids).argmin(axis=1)
+    return labels
+
+
+def kmeans(coords, k, iterations=15, seed=0):
+    """
+    Lloyd's k-means with centroids initialized on random points; empty clusters are dropped.
+    :return: (labels, centroids)
+    """
+    rng = np.random.default_rng(seed)
+    centroids = coords[rng.choice(len(coords), size=k, replace=False)]
+    for _ in range(iterations):
+        labels = nearest_centroid(coords, centroids)
+        counts = np.bincount(labels, minlength=len(centroids))
+        keep = counts > 0
+        sums = np.stack([np.bincount(labels, weights=coords[:, axis], minlength=len(centroids))
+                         for axis in range(2)], axis=1)
+        moved = sums[keep] / counts[keep, None]
+        if len(moved) == len(centroids) and np.allclose(moved, centroids):
+            break
+        centroids = moved
+    return nearest_centroid(coords, centroids), centroids
+
+
+def partition(coords, max_cluster_size=DEFAULT_MAX_CLUSTER_SIZE, seed=0):
+    """
+    Splits points into spatial clusters of at most max_cluster_size points.
+    k-means targets half the limit per cluster, and clusters that still end up too large
+    are split again recursively.
+    :param coords: (n, 2) coordinates
+    :return: List of int64 arrays of point indices
+    """
+    coords = to_array(coords)
+    pending = [np.arange(len(coords))]
+    clusters = []
+    while pending:
+        members = pending.pop()
+        if len(members) <= max_cluster_size:
+            clusters.append(members)
+            continue
+        k = max(2, math.ceil(2 * len(members) / max_cluster_size))
+        labels, _ = kmeans(coords[members], k, seed=seed)
+        groups = [members[labels == label] for label in np.unique(labels)]
+        if len(groups) == 1:
+            # Duplicate points k-means cannot separate, split by position instead
+            groups = np.array_split(members, k)
+        pending.extend(groups)
+    return clusters
+
+
+def solve_cluster(coords, solver="greedy", metric="euclidean", moves=("2opt", "oropt"), time_budget_ms=None):
+    """
+    Solves one cluster on its own distance matrix. Module level so it can run in a process pool.
+    :return: Cycle over the cluster's local indices (not closed)
+    """
+    if len(coords) <= 2:
+        return list(range(len(coords)))
+    distances = distance_matrix(coords, metric)
+    tour = TOUR_HEURISTICS[solver](distances)
+    if moves:
+        tour, _ = local_search(tour, distances, moves=moves, time_budget_ms=time_budget_ms)
+    return [int(node) for node in tour[:-1]]
+
+
+def order_clusters(centroids, metric="euclidean"):
+    """
+    Visiting order of the clusters from a nearest-neighbour + 2-opt tour over their centroids.
+    """
+    if len(centroids) <= 3:
+        return list(range(len(centroids)))
+    distances = distance_matrix(centroids, metric)
+    tour, _ = local_search(nearest_neighbor_tour(distances, 0)[0], distances, moves=("2opt",))
+    return [int(node) for node in tour[:-1]]
+
+
+def open_cycle(cycle, coords, entry_from, exit_towards, metric="euclidean"):
+    """
+    Cuts a cluster cycle into a path that starts close to the previous cluster's exit and ends
+    close to the next cluster. Every cut edge and both directions are scored at once.
+    :param cycle: Global point indices of the cluster cycle
+    :param entry_from: Coordinates of the previous exit point, or None for the first cluster
+    :param exit_towards: Coordinates of the next cluster's centroid, or None for the last
+    :return: Path of global point indices
+    """
+    cycle = np.asarray(cycle)
+    if len(cycle) <= 1:
+        return cycle
+    block = METRICS[metric]
+    points = coords[cycle]
+    after = np.roll(points, -1, axis=0)
+    zeros = np.zeros(len(cycle))
+    # Forward: cut edge (i, i+1), enter at i+1 and leave at i; backward: enter at i, leave at i+1
+    enter_next = block(entry_from[None, :], after)[0] if entry_from is not None else zeros
+    enter_here = block(entry_from[None, :], points)[0] if entry_from is not None else zeros
+    leave_here = block(points, exit_towards[None, :])[:, 0] if exit_towards is not None else zeros
+    leave_next = block(after, exit_towards[None, :])[:, 0] if exit_towards is not None else zeros
+    removed = paired_distances(points, after, metric)
+    forward = enter_next + leave_here - removed
+    backward = enter_here + leave_next - removed
+
+    i = int(np.argmin(np.minimum(forward, backward)))
+    path = np.roll(cycle, -(i + 1))
+    return path if forward[i] <= backward[i] else path[::-1]
+
+
+def repair_window(path, coords, metric="euclidean", moves=("oropt",), time_budget_ms=None):
+    """
+    Improves an open path with fixed endpoints using the closed-tour local search.
+    A dummy node at index 0 is 0 away from both endpoints and far from everything else,
+    so the tour dummy -> start ... end -> dummy can only change in its interior.
+    :return: Reordered path of the same points, same endpoints
+    """
+    m = len(path)
+    if m < 4:
+        return path
+    distances = np.empty((m + 1, m + 1))
+    distances[1:, 1:] = distance_matrix(coords[path], metric)
+    far = distances[1:, 1:].max() * m + 1
+    distances[0, :] = distances[:, 0] = far
+    distances[0, 0] = distances[0, 1] = distances[1, 0] = distances[0, m] = distances[m, 0] = 0
+
+    tour, _ = local_search([0] + list(range(1, m + 1)) + [0], distances, moves=moves, time_budget_ms=time_budget_ms)
+    inner = np.asarray(tour[1:-1]) - 1
+    if inner[0] != 0:
+        inner = inner[::-1]
+    return path[inner]
+
+
+def path_length(tour, coords, metric="euclidean"):
+    """
+    Length of a tour from coordinates, without a distance matrix.
+    """
+    points = coords[np.asarray(tour)]
+    return float(paired_distances(points[:-1], points[1:], metric).sum())
+
+
+def _orient_from_start(cycle, coords, centroids, order, metric):
+    """
+    Of the two directions around the start cluster's cycle, keeps the one ending closer to the next cluster.
+    """
+    if len(order) < 2 or len(cycle) < 3:
+        return cycle
+    block = METRICS[metric]
+    target = centroids[order[1]][None, :]
+    backward = np.concatenate([cycle[:1], cycle[1:][::-1]])
+    if block(coords[backward[-1:]], target)[0, 0] < block(coords[cycle[-1:]], target)[0, 0]:
+        return backward
+    return cycle
+
+
+def cluster_tour(coords, max_cluster_size=DEFAULT_MAX_CLUSTER_SIZE, solver="greedy", metric="euclidean",
+                 moves=("2opt", "oropt"), time_budget_ms=None, seam_window=SEAM_WINDOW,
+                 seam_moves=("oropt",), workers=None, executor=None, start=0, seed=0):
+    """
+    Divide and conquer tour for large point sets.
+    :param coords: (n, 2) coordinates ((lat, lng) for haversine)
+    :param max_cluster_size: Largest cluster solved on one matrix, bounds memory to O(size^2) per worker
+    :param solver: "greedy", "kruskal" or "prim" for the clusters
+    :param moves: Local search moves applied inside every cluster, empty to skip
+    :param time_budget_ms: Local search budget per cluster
+    :param seam_window: Points taken on each side of a seam for the Or-opt repair, 0 to skip
+    :param workers: Process count when no executor is given
+    :param executor: Optional concurrent.futures executor for the cluster solves
+    :param start: Point the closed tour begins and ends at
+    :return: (tour, length): closed tour of point indices and its length
+    """
+    if solver not in TOUR_HEURISTICS:
+        raise ValueError(f"Unknown solver '{solver}', expected one of {sorted(TOUR_HEURISTICS)}")
+    coords = to_array(coords)
+    n = len(coords)
+    if n == 0:
+        return [], 0.0
+
+    clusters = partition(coords, max_cluster_size, seed)
+    args = [(coords[members], solver, metric, tuple(moves), time_budget_ms) for members in clusters]
+    if executor is not None:
+        cycles = list(executor.map(solve_cluster, *zip(*args)))
+    elif len(clusters) == 1 or workers == 1:
+        cycles = [solve_cluster(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            cycles = list(pool.map(solve_cluster, *zip(*args)))
+    cycles = [members[cycle] for members, cycle in zip(clusters, cycles)]
+
+    centroids = np.array([coords[members].mean(axis=0) for members in clusters])
+    order = order_clusters(centroids, metric)
+    # Begin with the cluster holding the start point
+    start_cluster = next(c for c, members in enumerate(clusters) if (members == start).any())
+    first = order.index(start_cluster)
+    order = order[first:] + order[:first]
+
+    paths = []
+    seams = []
+    exit_point = None
+    for position, c in enumerate(order):
+        cycle = cycles[c]
+        if position == 0:
+            # The start point opens the tour, cut its cycle next to it
+            at = int(np.flatnonzero(cycle == start)[0])
+            cycle = np.roll(cycle, -at)
+            path = _orient_from_start(cycle, coords, centroids, order, metric)
+        else:
+            next_centroid = centroids[order[position + 1]] if position + 1 < len(order) else coords[start]
+            path = open_cycle(cycle, coords, exit_point, next_centroid, metric)
+        if paths:
+            seams.append(sum(len(p) for p in paths))
+        paths.append(path)
+        exit_point = coords[path[-1]]
+    tour = np.concatenate(paths)
+
+    if seam_window:
+        for seam in seams:
+            lo, hi = max(seam - seam_window, 1), min(seam + seam_window, len(tour))
+            if hi - lo >= 4:
+                tour[lo - 1:hi] = repair_window(tour[lo - 1:hi], coords, metric, seam_moves)
+
+    tour = tour.tolist() + [int(tour[0])]
+    return tour, path_length(tour, coords, metric)
+
@@ -0,0 +1,43 @@
+from collections import defaultdict
+
+import numpy as np
+
+
+def prim_mst(distances):
+    """
+    Prim's algorithm on a dense distance matrix using key/parent arrays.
+    Each iteration picks the closest non-tree node with an argmin and relaxes
+    the keys with a vectorized update, so it runs in O(n^2) time with O(n) extra memory.
+    :param distances: 2D array-like (n x n) distance matrix
+    :return: MST adjacency (node -> list of neighbours), rooted at node 0
+    """
+    distances = np.asarray(distances)
+    n = distances.shape[0]
+    mst = defaultdict(list)
+    if n == 0:
+        return mst
+
+    key = np.full(n, np.inf)
+    parent = np.full(n, -1, dtype=np.int64)
+    outside = np.ones(n, dtype=bool)
+    closer = np.empty(n, dtype=bool)
+    key[0] = 0
+
+    for _ in range(n):
+        u = int(key.argmin())
+        if not outside[u]:
+            # Only unreachable nodes are left, start a new tree from the first of them
+            u = int(outside.argmax())
+        key[u] = np.inf
+        outside[u] = False
+        if parent[u] != -1:
+            mst[u].append(int(parent[u]))
+            mst[int(parent[u])].append(u)
+
+        row = distances[u]
+        np.less(row, key, out=closer)
+        closer &= outside
+        np.copyto(key, row, where=closer, casting="unsafe")
+        np.copyto(parent, u, where=closer)
+
+    return mst
@@ -0,0 +1,157 @@
+import numpy as np
+
+from src.distances import to_array
+
+
+class GridIndex:
+    """
+    Uniform grid over 2D points for neighbour queries without a distance matrix.
+    Points are sorted by cell so every column of neighbouring cells is one contiguous slice.
+    """
+
+    def __init__(self, coords, points_per_cell=16):
+        self.coords = to_array(coords)
+        n = self.coords.shape[0]
+        self.low = self.coords.min(axis=0) if n else np.zeros(2)
+        span = (self.coords.max(axis=0) - self.low) if n else np.ones(2)
+        span = np.maximum(span, 1e-9)
+
+        # Square cells sized so that each holds points_per_cell points on average
+        self.cell = max(np.sqrt(span[0] * span[1] * points_per_cell / max(n, 1)), span.max() / 4096, 1e-9)
+        self.nx = int(span[0] // self.cell) + 1
+        self.ny = int(span[1] // self.cell) + 1
+
+        cells = self.cell_of(self.coords)
+        keys = cells[:, 0] * self.ny + cells[:, 1]
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+        self.sorted_coords = self.coords[self.order]
+        self.cell_start = np.searchsorted(self.sorted_keys, np.arange(self.nx * self.ny + 1))
+
+    def cell_of(self, coords):
+        cells = ((coords - self.low) // self.cell).astype(np.int64)
+        cells[:, 0] = np.clip(cells[:, 0], 0, self.nx - 1)
+        cells[:, 1] = np.clip(cells[:, 1], 0, self.ny - 1)
+        return cells
+
+    def ring(self, cx, cy, radius):
+        """
+        Sorted positions of all points within `radius` cells of cell (cx, cy).
+        """
+        y0 = max(cy - radius, 0)
+        y1 = min(cy + radius, self.ny - 1)
+        slices = []
+        for x in range(max(cx - radius, 0), min(cx + radius, self.nx - 1) + 1):
+            start = self.cell_start[x * self.ny + y0]
+            stop = self.cell_start[x * self.ny + y1 + 1]
+            if stop > start:
+                slices.append(np.arange(start, stop))
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+
+def knn_graph(coords, k=8):
+    """
+    Undirected k-nearest-neighbour edge set built with a uniform grid.
+    Each cell's points are queried together against the surrounding ring of cells,
+    and the ring grows until the k-th neighbour is provably inside it.
+    :param coords: List of (label, x, y) tuples or (n, 2) coordinates
+    :param k: Number of neighbours per point
+    :return: (u, v, weight) arrays with u < v and no duplicate edges
+    """
+    index = GridIndex(coords, points_per_cell=max(2 * (k + 1), 8))
+    n = index.coords.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+
+    src = np.empty((n, k), dtype=np.int64)
+    dst = np.empty((n, k), dtype=np.int64)
+    weight = np.empty((n, k))
+
+    for key in np.unique(index.sorted_keys):
+        members = np.arange(index.cell_start[key], index.cell_start[key + 1])
+        cx, cy = divmod(int(key), index.ny)
+        radius = 1
+        while True:
+            candidates = index.ring(cx, cy, radius)
+            if len(candidates) > k:
+                diff = index.sorted_coords[members, None, :] - index.sorted_coords[None, candidates, :]
+                dist = np.hypot(diff[..., 0], diff[..., 1])
+                dist[members[:, None] == candidates[None, :]] = np.inf
+                nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+                nearest_dist = np.take_along_axis(dist, nearest, axis=1)
+                # Anything outside the ring is at least radius cells away from this cell
+                whole_grid = radius >= max(index.nx, index.ny)
+                if whole_grid or nearest_dist.max() <= radius * index.cell:
+                    break
+            radius += 1
+
+        rows = index.order[members]
+        src[rows] = rows[:, None]
+        dst[rows] = index.order[candidates[nearest]]
+        weight[rows] = nearest_dist
+
+    u = np.minimum(src, dst).ravel()
+    v = np.maximum(src, dst).ravel()
+    _, first = np.unique(u * n + v, return_index=True)
+    return u[first], v[first], weight.ravel()[first]
+
+
+def nearest_foreign_pairs(coords, labels, points_per_cell=16, chunk=256):
+    """
+    For every label, the closest pair of points (i, j) with labels[i] == label != labels[j].
+    Points are grouped by grid cell and label; the gap between two cells bounds the distance of
+    their points from below, so only cell pairs that can still beat the best pair found from one
+    representative point per group are compared point by point.
+    :param coords: (n, 2) coordinates
+    :param labels: (n,) non-negative int labels, e.g. connected component roots
+    :return: (u, v, weight) arrays with one edge per label, empty when there is a single label
+    """
+    index = GridIndex(coords, points_per_cell)
+    labels = np.asarray(labels, dtype=np.int64)
+    _, labels = np.unique(labels, return_inverse=True)
+    n_labels = int(labels.max()) + 1 if len(labels) else 0
+    if n_labels < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+
+    # Groups: the points of one label inside one cell, in point order of the grid
+    group_of, order = np.unique(index.sorted_keys * n_labels + labels[index.order], return_inverse=True)
+    members = np.argsort(order, kind="stable")
+    group_start = np.searchsorted(order[members], np.arange(len(group_of) + 1))
+    points = index.order[members]
+    cx, cy = np.divmod(group_of // n_labels, index.ny)
+    group_label = group_of % n_labels
+    reps = index.coords[points[group_start[:-1]]]
+
+    # Upper bound per label from the representatives, lower bound per group pair from the cells
+    bound = np.full(n_labels, np.inf)
+    for start in range(0, len(group_of), chunk):
+        rows = slice(start, start + chunk)
+        diff = reps[rows, None, :] - reps[None, :, :]
+        dist = np.hypot(diff[..., 0], diff[..., 1])
+        dist[group_label[rows, None] == group_label[None, :]] = np.inf
+        np.minimum.at(bound, group_label[rows], dist.min(axis=1))
+
+    best = np.full(n_labels, np.inf)
+    u = np.full(n_labels, -1, dtype=np.int64)
+    v = np.full(n_labels, -1, dtype=np.int64)
+    for start in range(0, len(group_of), chunk):
+        rows = np.arange(start, min(start + chunk, len(group_of)))
+        gap_x = np.maximum(np.abs(cx[rows, None] - cx[None, :]) - 1, 0)
+        gap_y = np.maximum(np.abs(cy[rows, None] - cy[None, :]) - 1, 0)
+        lower = np.hypot(gap_x, gap_y) * index.cell
+        lower[group_label[rows, None] == group_label[None, :]] = np.inf
+        for a, others in zip(rows.tolist(), lower <= np.minimum(bound, best)[group_label[rows], None]):
+            others = np.flatnonzero(others)
+            if not len(others):
+                continue
+            mine = points[group_start[a]:group_start[a + 1]]
+            theirs = np.concatenate([points[group_start[b]:group_start[b + 1]] for b in others.tolist()])
+            diff = index.coords[mine, None, :] - index.coords[None, theirs, :]
+            dist = np.hypot(diff[..., 0], diff[..., 1])
+            i, j = np.unravel_index(np.argmin(dist), dist.shape)
+            label = group_label[a]
+            if dist[i, j] < best[label]:
+                best[label] = dist[i, j]
+                u[label], v[label] = mine[i], theirs[j]
+    return u, v, best
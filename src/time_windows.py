@@ -0,0 +1,88 @@
+import numpy as np
+
+
+def schedule(tour, durations, windows, service_times):
+    """
+    Simulates a closed tour: arrival and service start at every position, waiting when early.
+    :param tour: Closed tour [depot, ..., depot]
+    :param durations: 2D numpy array (n x n) of travel times
+    :param windows: (n, 2) array of [earliest, latest] service start times
+    :param service_times: (n,) array of time spent at each stop
+    :return: (arrival, start) float arrays with one entry per tour position
+    """
+    tour = np.asarray(tour)
+    arrival = np.empty(len(tour), dtype=np.float64)
+    start = np.empty(len(tour), dtype=np.float64)
+    arrival[0] = start[0] = windows[tour[0], 0]
+    legs = durations[tour[:-1], tour[1:]]
+    for k in range(1, len(tour)):
+        arrival[k] = start[k - 1] + service_times[tour[k - 1]] + legs[k - 1]
+        start[k] = max(arrival[k], windows[tour[k], 0])
+    return arrival, start
+
+
+def forward_slack(tour, start, arrival, windows):
+    """
+    How far the service start at each position can be pushed later without violating
+    any window from there to the end of the tour, computed backwards in O(n):
+    slack[k] = min(latest[k] - start[k], wait[k + 1] + slack[k + 1]).
+    """
+    latest = windows[np.asarray(tour), 1]
+    wait = start - arrival
+    slack = np.empty(len(tour), dtype=np.float64)
+    slack[-1] = latest[-1] - start[-1]
+    for k in range(len(tour) - 2, -1, -1):
+        slack[k] = min(latest[k] - start[k], wait[k + 1] + slack[k + 1])
+    return slack
+
+
+def time_window_insertion(durations, windows, service_times=None, depot=0, costs=None):
+    """
+    Builds a tour that respects time windows by cheapest feasible insertion.
+    Each step scores every unrouted stop at every position at once. Feasibility of putting u
+    between i and j is O(1): u must start by its latest time, and the push it causes at j must
+    fit in j's forward slack, so the rest of the tour never has to be re-simulated. After an
+    insertion only the schedule and slack arrays are refreshed.
+    :param durations: 2D numpy array (n x n) of travel times
+    :param windows: (n, 2) [earliest, latest] service start times; the depot's window is the shift
+    :param service_times: Optional (n,) time spent at each stop
+    :param depot: Depot index
+    :param costs: Optional 2D numpy array (n x n) minimized by the insertion, durations by default
+    :return: (tour, arrival, start, unassigned): closed tour, arrival and service start per tour
+             position, and the stops that could not be inserted feasibly
+    """
+    durations = np.asarray(durations, dtype=np.float64)
+    n = durations.shape[0]
+    windows = np.asarray(windows, dtype=np.float64).reshape(n, 2)
+    service = np.zeros(n) if service_times is None else np.asarray(service_times, dtype=np.float64)
+    costs = durations if costs is None else np.asarray(costs, dtype=np.float64)
+
+    tour = [depot, depot]
+    unrouted = np.array([node for node in range(n) if node != depot], dtype=np.int64)
+    arrival, start = schedule(tour, durations, windows, service)
+
+    while len(unrouted):
+        route = np.asarray(tour)
+        slack = forward_slack(route, start, arrival, windows)
+        prev, succ = route[:-1], route[1:]
+
+        # Rows: unrouted stops, columns: insertion positions (between prev[p] and succ[p])
+        arrive_u = start[None, :-1] + service[prev][None, :] + durations[prev[None, :], unrouted[:, None]]
+        start_u = np.maximum(arrive_u, windows[unrouted, 0][:, None])
+        arrive_j = start_u + service[unrouted][:, None] + durations[unrouted[:, None], succ[None, :]]
+        push = np.maximum(arrive_j, windows[succ, 0][None, :]) - start[None, 1:]
+        feasible = (start_u <= windows[unrouted, 1][:, None]) & (push <= slack[None, 1:])
+
+        extra = (costs[prev[None, :], unrouted[:, None]] + costs[unrouted[:, None], succ[None, :]]
+                 - costs[prev, succ][None, :])
+        extra[~feasible] = np.inf
+        best = np.unravel_index(np.argmin(extra), extra.shape)
+        if not np.isfinite(extra[best]):
+            break
+
+        node, position = int(unrouted[best[0]]), int(best[1])
+        tour.insert(position + 1, node)
+        unrouted = np.delete(unrouted, best[0])
+        arrival, start = schedule(tour, durations, windows, service)
+
+    return tour, arrival, start, unrouted.tolist()
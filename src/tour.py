@@ -0,0 +1,64 @@
+import numpy as np
+
+
+def adjacency_to_csr(adjacency, n=None):
+    """
+    Packs an adjacency mapping into CSR arrays, keeping each node's neighbour order.
+    :param adjacency: Mapping node -> list of neighbours (e.g. the MST defaultdict)
+    :param n: Number of nodes, inferred from the largest node id when omitted
+    :return: (indptr, indices) int64 arrays; neighbours of u are indices[indptr[u]:indptr[u + 1]]
+    """
+    if n is None:
+        n = 1 + max((max(u, *neighbors) if neighbors else u for u, neighbors in adjacency.items()), default=-1)
+    degree = np.zeros(n + 1, dtype=np.int64)
+    for u, neighbors in adjacency.items():
+        degree[u + 1] = len(neighbors)
+    indptr = np.cumsum(degree)
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    for u, neighbors in adjacency.items():
+        indices[indptr[u]:indptr[u + 1]] = neighbors
+    return indptr, indices
+
+
+def preorder_tour(adjacency, start, n=None):
+    """
+    Shortcut Hamiltonian cycle from an iterative preorder walk of a tree.
+    Visits nodes in the same order as a recursive DFS, skips repeats as it goes
+    and closes the cycle at start, with a fixed-size stack and no recursion.
+    :param adjacency: Mapping node -> list of neighbours, or an (indptr, indices) CSR pair
+    :param start: Root of the walk
+    :param n: Number of nodes, inferred when omitted
+    :return: Tour as a list of nodes, beginning and ending at start
+    """
+    if isinstance(adjacency, tuple):
+        indptr, indices = adjacency
+    else:
+        indptr, indices = adjacency_to_csr(adjacency, n)
+    n = max(len(indptr) - 1, start + 1)
+
+    # Nodes past the end of indptr (e.g. an isolated start) have no neighbours
+    ptr = memoryview(np.concatenate([indptr, np.full(n + 1 - len(indptr), indptr[-1], dtype=np.int64)]))
+    nbr = memoryview(indices)
+    visited = bytearray(n)
+    stack = np.empty(len(indices) + 1, dtype=np.int64)
+    top = memoryview(stack)
+
+    tour = []
+    top[0] = start
+    size = 1
+    while size:
+        size -= 1
+        node = top[size]
+        if visited[node]:
+            continue
+        visited[node] = 1
+        tour.append(node)
+        # Push in reverse so the first neighbour is expanded first, as in the recursive walk
+        for i in range(ptr[node + 1] - 1, ptr[node] - 1, -1):
+            neighbor = nbr[i]
+            if not visited[neighbor]:
+                top[size] = neighbor
+                size += 1
+
+    tour.append(start)
+    return tour
@@ -0,0 +1,75 @@
+import numpy as np
+
+from src.distances import euclidean_block
+
+# Coordinate based edge weight types and how a raw Euclidean distance is rounded
+EDGE_WEIGHT_TYPES = ("EUC_2D", "CEIL_2D", "ATT")
+
+
+def read_tsplib(path):
+    """
+    Reads a TSPLIB .tsp file with a NODE_COORD_SECTION.
+    :param path: Path to the .tsp file
+    :return: (name, edge_weight_type, coords) with coords an (n, 2) float64 array
+    """
+    spec = {}
+    coords = []
+    with open(path, "r") as file:
+        in_coords = False
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            if in_coords:
+                if line == "EOF" or not line[0].isdigit():
+                    break
+                _, x, y = line.split()[:3]
+                coords.append((float(x), float(y)))
+            elif line == "NODE_COORD_SECTION":
+                in_coords = True
+            elif ":" in line:
+                key, value = line.split(":", 1)
+                spec[key.strip().upper()] = value.strip()
+
+    edge_weight_type = spec.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+    if edge_weight_type not in EDGE_WEIGHT_TYPES:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE '{edge_weight_type}', expected one of {EDGE_WEIGHT_TYPES}")
+    if "DIMENSION" in spec and int(spec["DIMENSION"]) != len(coords):
+        raise ValueError(f"Expected {spec['DIMENSION']} nodes in {path}, found {len(coords)}")
+    return spec.get("NAME", ""), edge_weight_type, np.array(coords, dtype=np.float64).reshape(-1, 2)
+
+
+def tsplib_round(raw, edge_weight_type):
+    """
+    Applies the TSPLIB rounding rule for edge_weight_type to raw Euclidean distances in place.
+    """
+    if edge_weight_type == "EUC_2D":
+        np.floor(raw + 0.5, out=raw)
+    elif edge_weight_type == "CEIL_2D":
+        np.ceil(raw, out=raw)
+    elif edge_weight_type == "ATT":
+        raw /= np.sqrt(10.0)
+        rounded = np.floor(raw + 0.5)
+        raw[...] = np.where(rounded < raw, rounded + 1, rounded)
+    else:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE '{edge_weight_type}'")
+    return raw
+
+
+def tsplib_distance_matrix(coords, edge_weight_type="EUC_2D", dtype=np.float32, out=None, block_size=1024):
+    """
+    Integer TSPLIB distances, so tour lengths are comparable with the published optima.
+    :param coords: (n, 2) coordinates
+    :param edge_weight_type: One of EDGE_WEIGHT_TYPES
+    :param dtype: Output dtype
+    :param out: Optional preallocated (n, n) array or np.memmap to fill
+    :param block_size: Rows computed per block
+    :return: (n, n) array of dtype
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    n = coords.shape[0]
+    distances = np.empty((n, n), dtype=dtype) if out is None else out
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        distances[start:stop] = tsplib_round(euclidean_block(coords[start:stop], coords), edge_weight_type)
+    return distances